@@ -4,12 +4,15 @@
 #
 """Passwords importer swiss army knife."""
 
+import pkgutil
 from collections import OrderedDict, defaultdict
+from importlib import import_module
 from typing import Callable, List, Dict, Union, Generator
 
-import pass_import.decrypters  # noqa
-import pass_import.formats  # noqa
-import pass_import.managers  # noqa
+import pass_import.decrypters
+import pass_import.formats
+import pass_import.managers
+from pass_import import manifest
 from pass_import.__about__ import (__author__, __copyright__, __email__,
                                    __license__, __summary__, __title__,
                                    __uri__, __version__)
@@ -25,11 +28,113 @@ class ManagerError(Exception):
     """Errors related to managers' management. Most likely a bug if raised."""
 
 
+def load():
+    """Import all the password managers, formats and decrypters modules.
+
+    Importing a module registers its classes. The modules are only imported
+    once, and only when the real classes are needed.
+    """
+    for package in (pass_import.decrypters, pass_import.formats,
+                    pass_import.managers):
+        for module in pkgutil.iter_modules(package.__path__):
+            import_module(f'{package.__name__}.{module.name}')
+
+
+def metadata(cls: Callable, detecter: bool = False) -> Dict:
+    """Return the manifest metadata of a password manager or detecter class.
+
+    The header is normalized to plain data: a CSV header is a list and the
+    signature is a sorted list.
+    """
+    meta = {
+        'module': cls.__module__,
+        'cls': cls.__name__,
+        'format': cls.format,
+        'cap': int(cls.cap),
+    }
+    if detecter:
+        return meta
+
+    header = cls.header() if hasattr(cls, 'header') else None
+    if isinstance(header, type({}.values())):
+        header = list(header)
+    signature = cls.signature() if hasattr(cls, 'signature') else frozenset()
+    meta.update({
+        'name': cls.name,
+        'version': cls.version,
+        'default': cls.default,
+        'only': cls.only,
+        'url': cls.url,
+        'hexport': cls.hexport,
+        'himport': cls.himport,
+        'header': header,
+        'signature': sorted(signature),
+    })
+    return meta
+
+
+class Metadata():
+    """Metadata of a password manager or detecter class, from the manifest.
+
+    It provides the same class attributes and header methods than the class
+    it describes, without importing its module. The class is imported by
+    :func:`~load`, only when it is used.
+
+    :param dict meta: Metadata of the class, as given by :func:`metadata`.
+
+    """
+
+    def __init__(self, meta: Dict):
+        self.meta = meta
+        self.__name__ = meta['cls']
+        self.__module__ = meta['module']
+        self.name = meta.get('name', '')
+        self.format = meta['format']
+        self.version = meta.get('version', '')
+        self.cap = Cap(meta['cap'])
+        self.default = meta.get('default', True)
+        self.only = meta.get('only', False)
+        self.url = meta.get('url', '')
+        self.hexport = meta.get('hexport', '')
+        self.himport = meta.get('himport', '')
+
+    def __repr__(self):
+        return f"<Metadata of {self.__module__}.{self.__name__}>"
+
+    def header(self):
+        """Header of the password manager."""
+        return self.meta.get('header')
+
+    def signature(self):
+        """Header signature of the password manager."""
+        return frozenset(self.meta.get('signature', []))
+
+    def load(self) -> Callable:
+        """Import and return the class."""
+        return getattr(import_module(self.__module__), self.__name__)
+
+    def usage(self) -> str:
+        """Get password manager usage."""
+        return self.load().usage()
+
+    def description(self) -> str:
+        """Get password manager description."""
+        return self.load().description()
+
+
 class Managers(set):
-    """Provide an interface to manage the managers' classes easily."""
+    """Provide an interface to manage the managers' classes easily.
 
-    def __init__(self):
-        super().__init__(get_managers())
+    :param managers: (optional) The password managers. Default: all the
+        registered classes, all the modules are imported.
+
+    """
+
+    def __init__(self, managers=None):
+        if managers is None:
+            load()
+            managers = get_managers()
+        super().__init__(managers)
 
     def classes(self, cap=Cap.IMPORT, frmt=None) -> Generator:
         """Generate the classes of pm with capabilities and format."""
@@ -99,7 +204,7 @@ class Managers(set):
                 else:
                     formats.append(pm)
 
-            formats.sort(key=lambda x: x.format)
+            formats.sort(key=lambda x: (x.format, x.__name__))
             formats.insert(0, default)
             matrix[name] = formats
         return matrix
@@ -123,12 +228,15 @@ class Detecters(OrderedDict):
         Cap.DECRYPT: []
     }
 
-    def __init__(self, cap=Cap.FORMAT):
+    def __init__(self, cap=Cap.FORMAT, detecters=None):
         self.cap = cap
         if self.cap not in Cap.FORMAT | Cap.DECRYPT:
             raise ManagerError('Capability not supported')
 
-        cls = get_detecters()
+        if detecters is None:
+            load()
+            detecters = get_detecters()
+        cls = detecters
         detecters = OrderedDict()
         for frmt in self.orders[cap]:
             for pm in cls:
@@ -139,3 +247,26 @@ class Detecters(OrderedDict):
             if pm.format not in self.orders[cap] and cap in pm.cap:
                 detecters[pm.format] = pm
         super().__init__(detecters)
+
+
+class Manifest(Managers):
+    """The password managers, served from the generated manifest.
+
+    It does not import any password manager module: the classes are
+    :class:`Metadata` objects. Only the real class returned by :func:`get` is
+    imported. The manifest is generated by ``make manifest``.
+
+    """
+
+    def __init__(self):
+        super().__init__(Metadata(meta) for meta in manifest.MANAGERS)
+
+    def get(self, name, frmt='', version='', cap=Cap.IMPORT
+            ) -> Union[Callable, None]:
+        """Import and return a manager class from its classname or format."""
+        return super().get(name, frmt, version, cap).load()
+
+    @staticmethod
+    def detecters(cap=Cap.FORMAT) -> Detecters:
+        """Return the detecters of the manifest, as :class:`Metadata`."""
+        return Detecters(cap, [Metadata(meta) for meta in manifest.DETECTERS])
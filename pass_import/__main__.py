@@ -4,19 +4,23 @@
 # Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import hashlib
 import io
 import os
 import sys
 import traceback
 from argparse import ArgumentParser, RawDescriptionHelpFormatter
+from concurrent.futures import ThreadPoolExecutor
 
-from pass_import import Detecters, Managers, __version__
-from pass_import.auto import AutoDetect
+from pass_import import Manifest, __version__
+from pass_import.audit import AuditCache, PwnedCache, PwnedFile
+from pass_import.auto import AutoDetect, DetectCache
 from pass_import.core import Cap
 from pass_import.errors import FormatError, PMError
-from pass_import.tools import Config, get_magics
+from pass_import.tools import (MAGIC, Config, Journal, get_cachedir,
+                               get_magics)
 
-MANAGERS = Managers()
+MANAGERS = Manifest()
 
 try:
     import jsonpath_ng.ext
@@ -99,9 +103,29 @@ class ArgParser(ArgumentParser):
         common.add_argument(
             '-P', '--pwned', action='store_true',
             help='Check imported passwords against haveibeenpwned.com.')
+        common.add_argument(
+            '--pwned-jobs', type=int, metavar='N', default=8,
+            help='Number of parallel requests to haveibeenpwned.com. '
+                 'Default: 8')
+        common.add_argument(
+            '--audit-cache', action='store_true',
+            help='Cache the audit results, keyed by a local secret, to only '
+                 'audit new or changed passwords on the next imports.')
+        common.add_argument(
+            '--pwned-file', action='store', metavar='path',
+            help='Check imported passwords against a local Pwned Passwords '
+                 'dataset instead of haveibeenpwned.com.')
+        common.add_argument(
+            '--pwned-index', nargs=2, metavar=('src', 'dst'),
+            help='Build a compact binary index from the Pwned Passwords '
+                 'dataset ordered by hash, to use with --pwned-file.')
         common.add_argument(
             '-d', '--dry-run', action='store_true',
             help='Do not import passwords, only show what would be imported.')
+        common.add_argument(
+            '-R', '--resume', action='store_true',
+            help='Resume an interrupted import, skip the passwords already '
+                 'exported.')
 
         # Extra options
         extra = self.add_argument_group(title='Extra optional arguments')
@@ -130,6 +154,22 @@ class ArgParser(ArgumentParser):
                  Example:
                   - '$.entries[*].tags[?@="Defaults"]' : Export only entries
                  with a tag matching 'Defaults'""")
+        extra.add_argument(
+            '--native', action='store_true',
+            help='Encrypt and decrypt the passwords with gpg instead of '
+                 'calling pass for each of them. Only used by pass.')
+        extra.add_argument(
+            '-j', '--jobs', type=int, metavar='N', default=1,
+            help='Number of passwords to decrypt or insert in parallel, if '
+                 'the password managers support it. Default: 1')
+        extra.add_argument(
+            '--batch', type=int, metavar='N', default=0,
+            help='With --native, number of passwords per git commit. '
+                 'Default: 0, a single commit for the whole import.')
+        extra.add_argument(
+            '--incremental', action='store_true',
+            help='Only write the passwords that changed since the last import.'
+                 ' Only used by the pass exporter.')
         extra.add_argument('--config', action='store', default='',
                            help="Set a config file. Default: '.import'")
 
@@ -222,6 +262,9 @@ def setup():
     if conf['list_importers'] or conf['list_exporters']:
         listmanagers(conf)
 
+    if conf.get('pwned_index'):
+        pwnedindex(conf)
+
     if conf['exporter'] == '':
         conf.die("destination password manager not present.")
 
@@ -232,9 +275,44 @@ def setup():
     if not conf['src']:
         conf.die("The source password manager or the path to import is empty.")
 
+    if conf['jobs'] < 1:
+        conf.die("The number of jobs must be a positive integer.")
+
+    if conf['batch'] < 0:
+        conf.die("The batch size cannot be negative.")
+
+    try:
+        getfilter(conf)
+    except ImportError as error:
+        conf.die(error)
+    except (JsonPathLexerError, JsonPathParserError) as error:
+        conf.debug(traceback.format_exc())
+        conf.die(f"Invalid filter expression: {error}")
+
+    if conf['pwned_jobs'] < 1:
+        conf.die("The number of parallel requests must be a positive integer.")
+
+    if conf.get('pwned_file'):
+        if not os.path.isfile(conf['pwned_file']):
+            conf.die(f"{conf['pwned_file']} is not a file.")
+        conf['pwned'] = True
+
     return conf
 
 
+def pwnedindex(conf):
+    """Build a binary index of a Pwned Passwords dataset."""
+    src, dst = conf['pwned_index']
+    if not os.path.isfile(src):
+        conf.die(f"{src} is not a file.")
+    try:
+        number = PwnedFile.build(src, dst)
+    except (FormatError, ValueError) as error:
+        conf.die(f"{src} is not a valid Pwned Passwords dataset: {error}")
+    conf.success(f"Index of {number} hashes written to {dst}")
+    sys.exit(0)
+
+
 def listmanagers(conf):
     """List the supported password managers."""
     cap = Cap.IMPORT if conf['list_importers'] is True else Cap.EXPORT
@@ -279,16 +357,50 @@ def listmanagers(conf):
     sys.exit(0)
 
 
+def getdetectcache(conf):
+    """Return the cache of the detection results, it is opened only once."""
+    if 'detectcache' not in conf:
+        conf['detectcache'] = DetectCache()
+    return conf['detectcache']
+
+
+def getdetected(conf, path, name=''):
+    """Return the manager class already detected for a file, if any."""
+    if not os.path.isfile(path):
+        return None
+    managers = getdetectcache(conf).get(path, conf).get('managers', {})
+    clsname = managers.get(name)
+    if clsname not in MANAGERS.clsnames():
+        return None
+    conf.verbose(f"Using the cached detection result: {clsname}.")
+    return MANAGERS.get(clsname)
+
+
+def setdetected(conf, path, pm, name=''):
+    """Store the manager class detected for a file."""
+    if pm is None or not os.path.isfile(path):
+        return
+    cache = getdetectcache(conf)
+    cache.set(path, conf, managers={name: pm.__name__})
+    cache.save()
+
+
 def decryptsource(conf):
     """Decrypt source file if required."""
     path = conf['src'][1] if len(conf['src']) >= 2 else conf['src'][0]
     if os.path.isfile(path):
-        decrypters = Detecters(Cap.DECRYPT)
-        frmt, encoding = get_magics(path)
+        decrypters = MANAGERS.detecters(Cap.DECRYPT)
+        cache = getdetectcache(conf)
+        magics = cache.get(path).get('magics')
+        if magics is None:
+            magics = get_magics(path)
+            if MAGIC:
+                cache.set(path, magics=list(magics))
+        frmt, encoding = magics
         if encoding:
             conf['encoding'] = encoding
         if frmt in decrypters:
-            with decrypters[frmt](path) as file:
+            with decrypters[frmt].load()(path) as file:
                 conf['plaintext'] = file.decrypt()
                 conf['decrypted'] = True
             conf.verbose(f"Source file decrypted using {frmt}.")
@@ -310,8 +422,12 @@ def detectmanager(conf):
             if conf['decrypted']:
                 to_detect = conf['plaintext']
 
-            detect = AutoDetect(settings=conf.getsettings())
-            pm = detect.manager(to_detect)
+            pm = getdetected(conf, prefix)
+            if pm is None:
+                detect = AutoDetect(settings=conf.getsettings())
+                pm = detect.manager(to_detect)
+                conf['detection'] = detect.detection
+                setdetected(conf, prefix, pm)
             if pm is None:
                 conf.die("Unable to detect the manager. Please try with: "
                          f"{conf['prog']} <manager> {prefix}")
@@ -325,8 +441,12 @@ def detectmanager(conf):
             if conf['decrypted']:
                 to_detect = conf['plaintext']
 
-            detect = AutoDetect(name, settings=conf.getsettings())
-            pm = detect.format(to_detect)
+            pm = getdetected(conf, prefix, name)
+            if pm is None:
+                detect = AutoDetect(name, settings=conf.getsettings())
+                pm = detect.format(to_detect)
+                conf['detection'] = detect.detection
+                setdetected(conf, prefix, pm, name)
 
         elif name in MANAGERS.clsnames():
             pm = MANAGERS.get(name)
@@ -351,8 +471,10 @@ def zxcvbn_parse(details):
     sequence = ''
     for seq in details.get('sequence', []):
         sequence += f"{seq['token']}({seq['pattern']}) "
-    res = f"Score {details['score']} ({details['guesses']} guesses). "
-    return res + f"This estimate is based on the sequence {sequence}"
+    res = f"Score {details['score']} ({details['guesses']} guesses)."
+    if sequence == '':
+        return res
+    return res + f" This estimate is based on the sequence {sequence}"
 
 
 # pylint: disable=inconsistent-return-statements
@@ -361,6 +483,10 @@ def pass_import(conf, cls_import):
     try:
         settings = conf.getsettings(conf['sroot'])
         with cls_import(conf['in'], settings=settings) as importer:
+            # Reuse the data already decoded while detecting the format.
+            detection = conf.pop('detection', None)
+            if detection is not None and detection.pm is cls_import:
+                importer.settree(detection.tree)
             importer.parse()
             if not importer.secure:  # pragma: no cover
                 conf.warning(f"The password manager {conf['importer']} has "
@@ -388,68 +514,206 @@ def pass_import(conf, cls_import):
         conf.die(error)
 
 
-def pass_export(conf, cls_export, data):
-    """Insert cleaned data into the password repository."""
+def getjournal(conf):
+    """Open the export journal, it is keyed by the source and the settings.
+
+    A source file is identified by its fingerprint, already computed for the
+    detection cache, so that it is not read again on each import.
+
+    :return Journal: The export journal, ``None`` in dry run mode or if it
+        cannot be written.
+    """
+    if conf['dry_run']:
+        return None
+
+    digest = hashlib.sha256()
+    path = conf['src'][-1]
+    if os.path.isfile(path):
+        digest.update(getdetectcache(conf).fingerprint(path).encode())
+    else:
+        digest.update(path.encode())
+    settings = [
+        'importer', 'exporter', 'out', 'sroot', 'droot', 'all', 'clean',
+        'convert', 'separator', 'filter'
+    ]
+    for key in settings:
+        digest.update(f"{key}={conf.get(key)}\n".encode())
+
+    journal = Journal(os.path.join(get_cachedir(), 'journal',
+                                   digest.hexdigest()))
+    try:
+        if conf['resume']:
+            journal.load()
+            conf.verbose(f"Resuming import, {len(journal.done)} passwords "
+                         "already exported.")
+        journal.open(conf['resume'])
+    except OSError as error:
+        conf.warning(f"Unable to open the export journal, the import will "
+                     f"not be resumable: {error}")
+        return None
+    return journal
+
+
+def pass_insert(exporter, entry, pmpath, journal=None):
+    """Insert an entry and record it in the journal."""
+    exporter.insert(entry)
+    if journal is not None:
+        journal.add(pmpath)
+
+
+def getpwnedcache(conf):
+    """Return the cache of the haveibeenpwned hash ranges, if enabled.
+
+    Its time to live, in days, and its maximum size, in MiB, are read from
+    the ``pwned_ttl`` and ``pwned_cachesize`` configuration keys. A time to
+    live of ``0`` disables the cache.
+    """
+    ttl = conf.get('pwned_ttl', 7)
+    if not conf['pwned'] or ttl <= 0:
+        return None
+    return PwnedCache(ttl=ttl * 24 * 3600,
+                      maxsize=conf.get('pwned_cachesize', 64) * 1024 * 1024)
+
+
+def getauditcache(conf):
+    """Return the cache of the audit results, if enabled.
+
+    Its time to live is the ``pwned_ttl`` configuration key, in days.
+    """
+    if not conf.get('audit_cache', False):
+        return None
+    return AuditCache(ttl=conf.get('pwned_ttl', 7) * 24 * 3600)
+
+
+def pass_export(conf, cls_export, data, journal=None):
+    """Insert cleaned data into the password repository.
+
+    If a journal is given, the passwords already present in it are not
+    inserted again, and it is removed once all the passwords are exported.
+    """
     paths_imported = []
     paths_exported = []
+    failed = False
     try:
+        # The filter is run on the imported entries, before they are cleaned
+        # and audited, so that the excluded entries are never processed.
+        matched = pass_filter(conf, data)
+        if matched is not None:
+            for entry in data:
+                if id(entry) not in matched:
+                    paths_imported.append(os.path.join(
+                        conf['droot'], entry.get('group') or '',
+                        entry.get('title') or ''))
+            data = [entry for entry in data if id(entry) in matched]
+
         settings = conf.getsettings(conf['droot'], Cap.EXPORT)
         with cls_export(conf['out'], settings=settings) as exporter:
             exporter.data = data
             exporter.clean(conf['clean'], conf['convert'])
-            report = exporter.audit(conf['pwned'])
-            for entry in exporter.data:
-                pmpath = os.path.join(conf['droot'], entry.get(
-                    'path', entry.get('title', '')))
-                conf.show(entry)
-                exported = pass_filter(conf, entry)
-                try:
-                    if exported:
-                        if not conf['dry_run']:
-                            exporter.insert(entry)
-                except PMError as error:
-                    conf.debug(traceback.format_exc())
-                    conf.warning(f"Impossible to insert {pmpath} into "
-                                 f"{conf['exporter']}: {error}")
-                else:
-                    paths_imported.append(pmpath)
-                    if exported:
+            pwnedcache = getpwnedcache(conf)
+            report = exporter.audit(conf['pwned'], conf.get('pwned_jobs', 8),
+                                    pwnedcache, conf.get('pwned_file'),
+                                    getauditcache(conf))
+            if pwnedcache is not None and pwnedcache.error is not None:
+                conf.warning("Unable to write the haveibeenpwned cache, the "
+                             f"audit ran without it: {pwnedcache.error}")
+
+            # Inserts are run in a thread pool, results are read back in the
+            # data order so that the report stays deterministic.
+            jobs = conf.get('jobs', 1) if exporter.threadsafe else 1
+            results = []
+            executor = ThreadPoolExecutor(max_workers=jobs)
+            try:
+                for entry in exporter.data:
+                    pmpath = os.path.join(conf['droot'], entry.get(
+                        'path', entry.get('title', '')))
+                    conf.show(entry)
+                    future = None
+                    if journal is not None and pmpath in journal:
+                        conf.verbose(f"{pmpath} already exported, skipped.")
+                    elif not conf['dry_run']:
+                        future = executor.submit(pass_insert, exporter, entry,
+                                                 pmpath, journal)
+                    results.append((pmpath, future))
+
+                for pmpath, future in results:
+                    try:
+                        if future is not None:
+                            future.result()
+                    except PMError as error:
+                        failed = True
+                        conf.debug(traceback.format_exc())
+                        conf.warning(f"Impossible to insert {pmpath} into "
+                                     f"{conf['exporter']}: {error}")
+                    else:
+                        paths_imported.append(pmpath)
                         paths_exported.append(pmpath)
+            except BaseException:
+                # Do not wait for all the pending inserts on interruption.
+                for _, future in results:
+                    if future is not None:
+                        future.cancel()
+                raise
+            finally:
+                executor.shutdown()
+
     except PMError as error:
         conf.debug(traceback.format_exc())
         conf.die(error)
 
+    if journal is not None:
+        if failed:
+            journal.close()
+        else:
+            journal.remove()
     return paths_imported, paths_exported, report
 
 
-def pass_filter(conf, entry):
-    """Filter entry based on a JSONPath filter expression."""
+def getfilter(conf):
+    """Compile the JSONPath filter expression, only once.
+
+    :return: The compiled expression, or None if there is no filter.
+    :raise ImportError: If jsonpath-ng is not installed.
+    :raise JsonPathLexerError, JsonPathParserError: If the filter expression
+        is not valid.
+    """
     filter_expression = conf.get('filter', None)
     if filter_expression is None:
-        return True
+        return None
 
     if not JSONNG:
         message = ("--filter requires pass-import[filter] "
                    "or pass-import[all] to be installed")
         raise ImportError('Missing packages. ' + message)
 
-    # Having end users write their JSONPath filter expression as if
-    # pass-import processes/filters entries in bulk, will allow end
-    # users filter expression to continue to work when/if bulk filter is
-    # supported. Hence 'entries' being added
-    data = {'entries': [entry]}
-    try:
+    if conf.get('filter_compiled', (None,))[0] != filter_expression:
         expr = jsonpath_ng.ext.parse(filter_expression)
-        matches = expr.find(data)
-        return len(matches) > 0
-    except (JsonPathLexerError, JsonPathParserError) as e:
-        conf.warning("Entry not exported due to error "
-                     "most likely in FILTER expression"
-                     + e.args[0])
-        if conf.verb >= 2:
-            conf.verbose("- Filter expression:" + filter_expression)
-            conf.verbose("- Entry: " + data)
-        return False
+        conf['filter_compiled'] = (filter_expression, expr)
+    return conf['filter_compiled'][1]
+
+
+def pass_filter(conf, data):
+    """Filter the entries based on a JSONPath filter expression.
+
+    The expression is run once over all the entries, as ``$.entries``.
+
+    :return set: The ids of the entries matching the filter, or None if all
+        the entries are matching.
+    """
+    expr = getfilter(conf)
+    if expr is None:
+        return None
+
+    matched = set()
+    for match in expr.find({'entries': data}):
+        # Find the entry the match belongs to, by walking up to the entries.
+        node = match
+        while node.context is not None and node.context.value is not data:
+            node = node.context
+        if node.context is None or node.value is data:
+            return None
+        matched.add(id(node.value))
+    return matched
 
 
 def report(conf, paths_imported, paths_exported, audit):
@@ -507,12 +771,17 @@ def main():
     cls_export = MANAGERS.get(conf['exporter'], cap=Cap.EXPORT)
     conf.verbose(f"Importing passwords from {cls_import.__name__} "
                  f"to {cls_export.__name__}")
+    source = "on haveibeenpwned.com"
+    if conf.get('pwned_file'):
+        source = f"in {conf['pwned_file']}"
     conf.verbose("Checking for breached passwords",
-                 "on haveibeenpwned.com" if conf['pwned'] else '')
+                 source if conf['pwned'] else '')
 
     # Import & export
     data = pass_import(conf, cls_import)
-    paths_imported, paths_exported, audit = pass_export(conf, cls_export, data)
+    journal = getjournal(conf)
+    paths_imported, paths_exported, audit = pass_export(
+        conf, cls_export, data, journal)
 
     # Success!
     report(conf, paths_imported, paths_exported, audit)
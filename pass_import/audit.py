@@ -3,27 +3,177 @@
 # Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
 #
 
+import contextlib
 import hashlib
+import hmac
+import json
+import mmap
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
 from zxcvbn import zxcvbn
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Tuple
 
 import pass_import
+from pass_import.errors import FormatError
+from pass_import.tools import get_cachedir, get_secret
+
+
+class PwnedCache():
+    """On-disk cache of the haveibeenpwned hash ranges.
+
+    Every range is stored in its own file named after its prefix, as an array
+    of binary records: the 35 hexadecimal characters of the hash that follow
+    the prefix, packed in 18 bytes, and the count as a 32 bits integer.
+
+    The modification time of a file is the time the range was downloaded, it
+    is used to expire the ranges older than ``ttl``. The access time is
+    updated on every hit, the least recently used ranges are removed first
+    when the cache grows over ``maxsize``.
+
+    :param str path: Cache directory.
+        Default: ``$XDG_CACHE_HOME/pass-import/hibp``
+    :param int ttl: Time to live of a range in seconds. Default: a week.
+    :param int maxsize: Maximum size of the cache in bytes. Default: 64 MiB.
+    :param OSError error: The first error writing the cache. The cache is not
+        written anymore after an error, the audit goes on without it.
+
+    """
+    record = struct.Struct('>18sI')
+
+    def __init__(self, path: str = None, ttl: int = 7 * 24 * 3600,
+                 maxsize: int = 64 * 1024 * 1024):
+        self.path = os.path.join(get_cachedir(), 'hibp') if path is None \
+            else path
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.error = None
+
+    def get(self, prefix: str) -> Tuple[List[str], List[int]]:
+        """Return the cached bucket ``prefix``, None if missing or expired."""
+        path = os.path.join(self.path, prefix)
+        try:
+            stat = os.stat(path)
+            if time.time() - stat.st_mtime > self.ttl:
+                return None
+            with open(path, 'rb') as file:
+                content = file.read()
+            os.utime(path, ns=(time.time_ns(), stat.st_mtime_ns))
+        except OSError:
+            return None
+
+        hashes = []
+        counts = []
+        for suffix, count in self.record.iter_unpack(content):
+            hashes.append(prefix + suffix.hex()[1:].upper())
+            counts.append(count)
+        return (hashes, counts)
+
+    def set(self, prefix: str, bucket: Tuple[List[str], List[int]]):
+        """Store the bucket ``prefix`` in the cache."""
+        if self.error is not None:
+            return
+        content = bytearray()
+        for phash, count in zip(*bucket):
+            suffix = bytes.fromhex('0' + phash[len(prefix):])
+            content += self.record.pack(suffix, min(count, 0xFFFFFFFF))
+
+        path = os.path.join(self.path, prefix)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.path, mode=0o700, exist_ok=True)
+            with open(tmp, 'wb') as file:
+                file.write(content)
+            os.replace(tmp, path)
+        except OSError as error:
+            self.error = error
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+
+    def evict(self):
+        """Remove the least recently used ranges over ``maxsize``."""
+        if self.error is not None:
+            return
+        try:
+            with os.scandir(self.path) as entries:
+                files = [(entry.stat().st_atime, entry.stat().st_size,
+                          entry.path) for entry in entries if entry.is_file()]
+
+            size = sum(file[1] for file in files)
+            for _, filesize, path in sorted(files):
+                if size <= self.maxsize:
+                    break
+                os.remove(path)
+                size -= filesize
+        except FileNotFoundError:
+            return
+        except OSError as error:
+            self.error = error
 
 
 class PwnedAPI():
-    """Simple wrapper for https://haveibeenpwned.com API."""
+    """Simple wrapper for https://haveibeenpwned.com API.
+
+    All the requests go through a single keep-alive session. Responses with a
+    ``429`` or ``5xx`` status code, and connection errors, are retried with an
+    exponential backoff.
 
-    def __init__(self):
+    :param int jobs: Number of buckets to download in parallel. Default: 8
+    :param PwnedCache cache: Optional cache of the buckets already downloaded.
+
+    """
+    url = 'https://api.pwnedpasswords.com/range/'
+    retries = 5
+    backoff = 0.5
+
+    def __init__(self, jobs: int = 8, cache: PwnedCache = None):
+        self.jobs = jobs
+        self.cache = cache
         self.headers = {
             'user-agent': f"{pass_import.__title__}/{pass_import.__version__}"}
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_maxsize=max(jobs, 1))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def close(self):
+        """Close the HTTP session."""
+        self.session.close()
+
+    def _get(self, url: str) -> requests.Response:
+        """Get url, retry with an exponential backoff on transient errors."""
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * 2 ** attempt
+            try:
+                res = self.session.get(url, verify=True, timeout=5)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+            else:
+                if res.status_code != 429 and res.status_code < 500:
+                    break
+                if attempt == self.retries:
+                    break
+                retry = res.headers.get('Retry-After', '')
+                if retry.isdigit():
+                    delay = max(delay, int(retry))
+            time.sleep(delay)
+        res.raise_for_status()
+        return res
 
     def password_range(self, prefix: str) -> Tuple[List[str], List[int]]:
         """Query the haveibeenpwned api to retrieve the bucket ``prefix``."""
-        url = f"https://api.pwnedpasswords.com/range/{prefix}"
-        res = requests.get(url, headers=self.headers, verify=True, timeout=5)
-        res.raise_for_status()
+        if self.cache is not None:
+            bucket = self.cache.get(prefix)
+            if bucket is not None:
+                return bucket
+
+        res = self._get(self.url + prefix)
 
         hashes = []
         counts = []
@@ -31,8 +181,195 @@ class PwnedAPI():
             partialhash, count = item.split(':')
             hashes.append(prefix + partialhash)
             counts.append(int(count))
+        if self.cache is not None:
+            self.cache.set(prefix, (hashes, counts))
         return (hashes, counts)
 
+    def password_ranges(
+            self, prefixes: Iterable[str]
+    ) -> Dict[str, Tuple[List[str], List[int]]]:
+        """Retrieve the buckets of all ``prefixes``, ``jobs`` at a time."""
+        prefixes = list(prefixes)
+        with ThreadPoolExecutor(max_workers=max(self.jobs, 1)) as executor:
+            buckets = dict(zip(prefixes,
+                               executor.map(self.password_range, prefixes)))
+        if self.cache is not None:
+            self.cache.evict()
+        return buckets
+
+
+class PwnedFile():
+    """Local Pwned Passwords SHA-1 dataset, to check passwords offline.
+
+    The dataset can either be the text file ordered by hash distributed by
+    haveibeenpwned.com, with one ``<SHA-1>:<count>`` per line, or the compact
+    binary index built from it with :func:`~build`. In both cases, the file is
+    memory mapped and searched by bisection, it is never fully read.
+
+    :param str path: Path to the dataset.
+
+    """
+    magic = b'PIMPHIBP'
+    record = struct.Struct('>20sI')
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.binary = self.mmap[:len(self.magic)] == self.magic
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Unmap the dataset."""
+        self.mmap.close()
+
+    def count(self, phash: str) -> int:
+        """Return how many times the SHA-1 ``phash`` has been breached."""
+        if self.binary:
+            return self._count_binary(bytes.fromhex(phash))
+        return self._count_text(phash.upper().encode())
+
+    def _count_binary(self, phash: bytes) -> int:
+        size = self.record.size
+        low, high = 0, (len(self.mmap) - len(self.magic)) // size
+        while low < high:
+            mid = (low + high) // 2
+            offset = len(self.magic) + mid * size
+            key, count = self.record.unpack_from(self.mmap, offset)
+            if key == phash:
+                return count
+            if key < phash:
+                low = mid + 1
+            else:
+                high = mid
+        return 0
+
+    def _count_text(self, phash: bytes) -> int:
+        # low and high are always at the beginning of a line.
+        low, high = 0, len(self.mmap)
+        while low < high:
+            mid = (low + high) // 2
+            start = self.mmap.rfind(b'\n', low, mid) + 1 or low
+            end = self.mmap.find(b'\n', start)
+            if end == -1:
+                end = len(self.mmap)
+            key, _, count = self.mmap[start:end].partition(b':')
+            key = key.upper()
+            if key == phash:
+                return int(count)
+            if key < phash:
+                low = end + 1
+            else:
+                high = start
+        return 0
+
+    @classmethod
+    def build(cls, src: str, dst: str) -> int:
+        """Build the binary index ``dst`` from the text dataset ``src``.
+
+        :return int: The number of hashes in the index.
+        :raise FormatError: If the dataset is not ordered by hash.
+        :raise ValueError: If a line of the dataset is malformed.
+        """
+        number = 0
+        previous = b''
+        tmp = f"{dst}.{os.getpid()}.tmp"
+        try:
+            with open(src, 'rb') as text, open(tmp, 'wb') as index:
+                index.write(cls.magic)
+                for line in text:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    key, _, count = line.partition(b':')
+                    phash = bytes.fromhex(key.decode())
+                    if phash <= previous:
+                        raise FormatError(
+                            "the dataset must be ordered by hash.")
+                    index.write(cls.record.pack(phash, min(int(count),
+                                                           0xFFFFFFFF)))
+                    previous = phash
+                    number += 1
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        os.replace(tmp, dst)
+        return number
+
+
+class AuditCache():
+    """Persistent cache of the audit results.
+
+    The passwords are never stored, the results are indexed by an HMAC of
+    the password keyed with the local secret from
+    :func:`~pass_import.tools.get_secret`. Only the breach count, and the
+    zxcvbn score and guesses are kept, for ``ttl`` seconds.
+
+    :param str path: Path to the cache file.
+        Default: ``$XDG_CACHE_HOME/pass-import/audit.json``
+    :param int ttl: Time to live of a result in seconds. Default: a week.
+
+    """
+
+    def __init__(self, path: str = None, ttl: int = 7 * 24 * 3600):
+        self.path = os.path.join(get_cachedir(), 'audit.json') \
+            if path is None else path
+        self.ttl = ttl
+        self.secret = get_secret()
+        self.changed = False
+        self.results = {'pwned': {}, 'zxcvbn': {}}
+        try:
+            with open(self.path, 'r') as file:
+                self.results.update(json.load(file))
+        except (OSError, ValueError):
+            pass
+
+    def _key(self, values: Tuple[str]) -> str:
+        data = '\0'.join(values).encode()
+        return hmac.new(self.secret, data, hashlib.sha256).hexdigest()
+
+    def get(self, name: str, *values: str):
+        """Return the cached ``name`` result for ``values``, or None."""
+        result = self.results[name].get(self._key(values))
+        if result is None or time.time() - result[1] > self.ttl:
+            return None
+        return result[0]
+
+    def set(self, name: str, result, *values: str):
+        """Store the ``name`` result for ``values``."""
+        self.results[name][self._key(values)] = [result, int(time.time())]
+        self.changed = True
+
+    def save(self):
+        """Write the cache file, without the expired results."""
+        if not self.changed:
+            return
+        now = time.time()
+        for results in self.results.values():
+            expired = [key for key, result in results.items()
+                       if now - result[1] > self.ttl]
+            for key in expired:
+                del results[key]
+
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as file:
+            json.dump(self.results, file)
+        os.replace(tmp, self.path)
+        self.changed = False
+
+
+def _zxcvbn(task: Tuple[str, Tuple[str]]) -> Dict:
+    """Run zxcvbn on a password and its user inputs, in a worker process."""
+    password, user_inputs = task
+    return zxcvbn(password, user_inputs=list(user_inputs))
+
 
 class Audit():
     """Audit passwords for vulnerabilities.
@@ -42,11 +379,16 @@ class Audit():
 
     :param list[dict] data: The list of password entries to audit
         Each password entry is a dictionary.
+    :param AuditCache cache: Optional cache of the previous audit results.
+    :param int parallel: Minimum number of unique passwords to estimate
+        their strength in parallel.
 
     """
+    parallel = 100
 
-    def __init__(self, data):
+    def __init__(self, data, cache: AuditCache = None):
         self.data = data
+        self.cache = cache
         self.breached = []
         self.weak = []
         self.duplicated = []
@@ -62,31 +404,74 @@ class Audit():
             'skipped': self.skipped,
         }
 
-    def password(self):
-        """K-anonimity password breach detection on haveibeenpwned.com."""
+    def password(self, jobs: int = 8, cache: PwnedCache = None,
+                 dataset: str = None):
+        """K-anonimity password breach detection on haveibeenpwned.com.
+
+        :param int jobs: Number of buckets to download in parallel.
+        :param PwnedCache cache: Optional cache of the downloaded buckets.
+        :param str dataset: Optional path to a local Pwned Passwords dataset
+            to use instead of haveibeenpwned.com. See :class:`~PwnedFile`.
+
+        """
         # Generate the list of hashes and prefixes to query.
         data = []
-        api = PwnedAPI()
-        buckets = {}
+        counts = {}
+        missing = {}
         for entry in self.data:
             if entry.get('password', '') == '':
                 continue
-            password = entry['password'].encode("utf8")
-            phash = hashlib.sha1(password).hexdigest().upper()  # nosec
-            prefix = phash[0:5]
-            data.append((entry, phash, prefix))
-            if prefix not in buckets:
-                buckets[prefix] = api.password_range(prefix)
+            password = entry['password']
+            sha1 = hashlib.sha1(password.encode("utf8"))  # nosec
+            phash = sha1.hexdigest().upper()
+            data.append((entry, phash))
+            if phash in counts or phash in missing:
+                continue
+            count = None
+            if self.cache is not None:
+                count = self.cache.get('pwned', password)
+            if count is None:
+                missing[phash] = password
+            else:
+                counts[phash] = count
+
+        if dataset is not None and missing:
+            with PwnedFile(dataset) as pwned:
+                found = {phash: pwned.count(phash) for phash in missing}
+        elif missing:
+            prefixes = {phash[0:5]: None for phash in missing}
+            api = PwnedAPI(jobs, cache)
+            try:
+                buckets = api.password_ranges(prefixes)
+            finally:
+                api.close()
+            found = {}
+            for hashes, bucket in buckets.values():
+                found.update(zip(hashes, bucket))
+        for phash, password in missing.items():
+            counts[phash] = found.get(phash, 0)
+            if self.cache is not None:
+                self.cache.set('pwned', counts[phash], password)
 
         # Compare the data and return the breached passwords.
-        for entry, phash, prefix in data:
-            if phash in buckets[prefix][0]:
-                index = buckets[prefix][0].index(phash)
-                count = buckets[prefix][1][index]
+        for entry, phash in data:
+            count = counts[phash]
+            if count:
                 self.breached.append((entry.get('password', ''), count))
 
-    def zxcvbn(self):
-        """Password strength estimation using Dropbox' zxcvbn."""
+    def zxcvbn(self, jobs: int = None):
+        """Password strength estimation using Dropbox' zxcvbn.
+
+        The estimation is run once per unique password and user inputs, in a
+        pool of ``jobs`` processes when there are enough of them. Only the
+        string fields not longer than the password are used as user inputs,
+        longer ones can never match a part of the password.
+
+        :param int jobs: Number of processes. Default: the number of CPUs.
+
+        """
+        tasks = {}
+        entries = []
         for entry in self.data:
             if entry.get('password', '') == '':
                 continue
@@ -94,12 +479,38 @@ class Audit():
             if len(password) > 72:
                 self.skipped.append(entry)
                 continue
-            user_input = list(entry.values())
-            if password in user_input:
-                user_input.remove(password)
-            results = zxcvbn(password, user_inputs=user_input)
+            user_input = [value for value in entry.values()
+                          if isinstance(value, str) and
+                          len(value) <= len(password)]
+            user_input.remove(password)
+            task = (password, tuple(user_input))
+            tasks[task] = None
+            entries.append(task)
+
+        if self.cache is not None:
+            for task in tasks:
+                tasks[task] = self.cache.get('zxcvbn', task[0], *task[1])
+        todo = [task for task, results in tasks.items() if results is None]
+
+        jobs = jobs or os.cpu_count() or 1
+        if jobs > 1 and len(todo) >= self.parallel:
+            chunksize = max(1, len(todo) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = executor.map(_zxcvbn, todo, chunksize=chunksize)
+                tasks.update(zip(todo, results))
+        else:
+            tasks.update((task, _zxcvbn(task)) for task in todo)
+
+        if self.cache is not None:
+            for task in todo:
+                results = {'score': tasks[task]['score'],
+                           'guesses': float(tasks[task]['guesses'])}
+                self.cache.set('zxcvbn', results, task[0], *task[1])
+
+        for task in entries:
+            results = tasks[task]
             if results['score'] <= 2:
-                self.weak.append((password, results))
+                self.weak.append((task[0], results))
 
     def duplicates(self):
         """Check for duplicated passwords."""
@@ -3,15 +3,22 @@
 # Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
 #
 
+import codecs
+import hashlib
 import io
+import json
 import os
-from contextlib import contextmanager
-from typing import Callable, List, Tuple, Union
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, suppress
+from typing import Callable, Dict, FrozenSet, Iterable, List, Tuple, Union
 
 import pass_import
+from pass_import import manifest
 from pass_import.core import Cap
 from pass_import.detecter import Formatter
 from pass_import.errors import PMError
+from pass_import.tools import get_cachedir
 
 
 class DummyDetecter(Formatter):
@@ -44,10 +51,49 @@ class DummyDetecter(Formatter):
         return ''  # pragma: no cover
 
 
+class Source():
+    """File to detect, read only once and shared by all the detecters.
+
+    Each detecter gets its own cheap file object over the same buffer, in its
+    own mode and encoding, instead of opening and reading the file again.
+
+    :param str path: Path to the file to detect.
+    :param int headsize: Size of the head of the file given to the
+        :func:`~prefilter` methods of the detecters.
+
+    """
+    headsize = 4096
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            self.buffer = file.read()
+        head = self.buffer[:self.headsize]
+        if head.startswith(codecs.BOM_UTF8):
+            head = head[len(codecs.BOM_UTF8):]
+        self.head = head.lstrip()
+
+    def prefilter(self, cls) -> bool:
+        """Return ``False`` if the file cannot be in the format of ``cls``."""
+        return cls.prefilter(self.head)
+
+    def view(self, mode: str = 'r', encoding: str = 'utf-8') -> io.IOBase:
+        """Return a new file object over the shared buffer."""
+        stream = io.BytesIO(self.buffer)
+        if 'b' in mode:
+            return stream
+        return io.TextIOWrapper(stream, encoding=encoding)
+
+
 @contextmanager
-def detector(cls, prefix, settings=None):
-    """Context manager for password format/encryption detection."""
+def detector(cls, prefix, settings=None, source=None):
+    """Context manager for password format/encryption detection.
+
+    If a :class:`Source` is given, the detecter reads from a view over it
+    rather than from the file at ``prefix``.
+    """
     manager = cls(prefix, settings)
+    if source is not None:
+        manager.file = source.view(manager.mode, manager.encoding)
     try:
         manager.detecter_open()
     except (PMError, IsADirectoryError):
@@ -58,6 +104,68 @@ def detector(cls, prefix, settings=None):
     else:
         yield manager
         manager.detecter_close()
+    finally:
+        if source is not None:
+            manager.file.close()
+
+
+class HeaderIndex():
+    """Index of the password managers of a format by header signature.
+
+    The index maps each item of the pm signatures to the pm using it. The
+    candidates for a file are the pm whose signature is a subset of the file
+    signature. They are ordered by decreasing signature size (the most
+    specific header first) and then by class name, so that the detection
+    does not depend on the registry order.
+
+    :param managers: The password manager classes of the format.
+
+    """
+
+    def __init__(self, managers: Iterable[Callable]):
+        self.signatures = {pm: pm.signature() for pm in managers}
+        self.ordered = sorted(
+            self.signatures,
+            key=lambda pm: (-len(self.signatures[pm]), pm.__name__))
+        self.index = defaultdict(list)
+        for pm, signature in self.signatures.items():
+            for item in signature:
+                self.index[item].append(pm)
+
+    def candidates(self, signature: Union[FrozenSet, None]
+                   ) -> List[Callable]:
+        """Return the ordered pm that could match a file signature.
+
+        :param frozenset signature: Signature of the file, if ``None``, all
+            the pm are candidates.
+
+        """
+        if signature is None:
+            return self.ordered
+
+        hits = Counter()
+        for item in signature:
+            for pm in self.index.get(item, []):
+                hits[pm] += 1
+        return [
+            pm for pm in self.ordered
+            if hits[pm] == len(self.signatures[pm])
+        ]
+
+
+class Detection():
+    """Result of a successful detection.
+
+    :param pm: The detected password manager class.
+    :param tree: The data decoded while detecting the format (JSON object,
+        YAML document...), to be reused by the importer. ``None`` if there is
+        nothing to reuse.
+
+    """
+
+    def __init__(self, pm: Callable, tree=None):
+        self.pm = pm
+        self.tree = tree
 
 
 class AutoDetect():
@@ -70,22 +178,25 @@ class AutoDetect():
     :param str name: (optional) Name of the password manager. Only the
         ``manager`` method can be used without the manager name.
     :param str version: (optional) Version number of the password manager.
+    :param Detection detection: Result of the last successful detection.
 
     """
 
     def __init__(self, name='', settings=None):
         self.settings = {} if settings is None else settings
-        self.managers = pass_import.Managers()
-        self.formats = pass_import.Detecters(Cap.FORMAT)
-        self.decrypters = pass_import.Detecters(Cap.DECRYPT)
-        self.classes = self.managers.matrix().get(name, [])
+        self.managers = pass_import.Manifest()
+        self.formats = self.managers.detecters(Cap.FORMAT)
+        self.decrypters = self.managers.detecters(Cap.DECRYPT)
+        self.classes = self._load(name)
         self.stream = self.settings.get('decrypted', False)
+        self.indexes = {}
+        self.detection = None
 
     def default(self, name='') -> Callable:
         """Retrieve the class of the default importer."""
         classes = self.classes
         if name != '':
-            classes = self.managers.matrix().get(name, [])
+            classes = self._load(name)
         for pm in classes:
             if pm.default:
                 return pm
@@ -126,10 +237,12 @@ class AutoDetect():
         .. code-block:: console
 
             For all format classes in Formats:
+                Skip the format if the file head rules it out,
                 Open the path,
                 Check if it is in the considered format,
                 If yes:
-                    For all managers that support the format:
+                    For all managers whose header signature is in the
+                    file header signature, most specific first:
                         Compare manager header for the file header.
 
         :param str path: Path, directory, or plain data of the manager.
@@ -141,16 +254,40 @@ class AutoDetect():
             return None
 
         prefix = path
+        source = self._source(path)
         for frmt in self.formats:
+            cls = self.formats[frmt].load()
+            if source is not None and not source.prefilter(cls):
+                continue
             if self.stream:
                 prefix = io.StringIO(path)
-            with detector(self.formats[frmt], prefix, self.settings) as file:
+            with detector(cls, prefix, self.settings, source) as file:
                 if file.is_format():
-                    for pm in self.managers.classes(frmt=frmt):
+                    index = self._index(frmt)
+                    for pm in index.candidates(file.filesignature()):
                         if file.checkheader(pm.header(), pm.only):
+                            pm = pm.load()
+                            self.detection = Detection(pm, file.gettree())
                             return pm
         return None
 
+    def _load(self, name: str) -> List[Callable]:
+        """Import the classes of a password manager, default first."""
+        return [pm.load() for pm in self.managers.matrix().get(name, [])]
+
+    def _index(self, frmt: str) -> HeaderIndex:
+        """Return the header index of a format, built only once."""
+        if frmt not in self.indexes:
+            self.indexes[frmt] = HeaderIndex(
+                self.managers.classes(frmt=frmt))
+        return self.indexes[frmt]
+
+    def _source(self, path: str) -> Union[Source, None]:
+        """Read the file to detect once, if it is a file."""
+        if self.stream or not os.path.isfile(path):
+            return None
+        return Source(path)
+
     def _tryopen(self, path: str
                  ) -> Tuple[Union[Callable, None], List[Callable]]:
         """Knowing the manager's name, try to open the path in all formats.
@@ -161,6 +298,7 @@ class AutoDetect():
 
             For all classes that support the password manager 'name':
                 If the format is supported by pass-import:
+                    Skip the class if the file head rules it out
                     Open the path
                     Check if it is in the considered format
                         Compare manager header against the file header
@@ -176,14 +314,131 @@ class AutoDetect():
         """
         unknowns = []
         prefix = path
+        source = self._source(path)
         for pm in self.classes:
             if pm.format in self.formats:
+                if source is not None and not source.prefilter(pm):
+                    continue
                 if self.stream:
                     prefix = io.StringIO(path)
-                with detector(pm, prefix, self.settings) as file:
+                with detector(pm, prefix, self.settings, source) as file:
                     if file.is_format():
                         if file.checkheader(file.header(), file.only):
+                            self.detection = Detection(pm, file.gettree())
                             return pm, []
             else:
                 unknowns.append(pm)
         return None, unknowns
+
+
+class DetectCache():
+    """Persistent cache of the detection results, keyed by file fingerprint.
+
+    The fingerprint of a file is a hash of its size, its modification time,
+    and its first and last blocks. For each fingerprint, the cache keeps the
+    format and the encoding given by :func:`~pass_import.tools.get_magics`.
+    The password manager class detected for each manager name (``''`` when
+    the manager name was not given) is also keyed by the settings used by the
+    detection, listed in ``keyed``.
+
+    The whole cache is dropped when the registry version changes: a new
+    version of pass-import, or a different manifest of classes.
+
+    :param str path: Path to the cache file.
+        Default: ``$XDG_CACHE_HOME/pass-import/detect.json``
+    :param int size: Maximum number of files in the cache.
+
+    """
+    block = 65536
+    keyed = ('cols', 'decrypted', 'delimiter', 'encoding')
+
+    def __init__(self, path: str = None, size: int = 256):
+        self.path = os.path.join(get_cachedir(), 'detect.json') \
+            if path is None else path
+        self.size = size
+        self.version = self.registry()
+        self.changed = False
+        self.fingerprints = {}
+        self.entries = {}
+        try:
+            with open(self.path, 'r') as file:
+                cache = json.load(file)
+            if cache.get('version') == self.version:
+                self.entries = cache.get('entries', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    @staticmethod
+    def registry() -> str:
+        """Return the version of the managers and detecters registry."""
+        names = sorted(f"{meta['module']}.{meta['cls']}"
+                       for meta in manifest.MANAGERS + manifest.DETECTERS)
+        data = '\n'.join([pass_import.__version__] + names)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def fingerprint(self, path: str) -> str:
+        """Return the fingerprint of a file, it is computed only once."""
+        if path not in self.fingerprints:
+            stat = os.stat(path)
+            digest = hashlib.sha256(
+                f"{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+            with open(path, 'rb') as file:
+                digest.update(file.read(self.block))
+                if stat.st_size > self.block:
+                    file.seek(max(self.block, stat.st_size - self.block))
+                    digest.update(file.read(self.block))
+            self.fingerprints[path] = digest.hexdigest()
+        return self.fingerprints[path]
+
+    def key(self, path: str, settings: Dict = None) -> str:
+        """Return the cache key of a file, detected with some settings."""
+        key = self.fingerprint(path)
+        if settings is not None:
+            values = {name: settings.get(name) for name in self.keyed}
+            digest = hashlib.sha256(
+                json.dumps(values, sort_keys=True).encode())
+            key += f"-{digest.hexdigest()}"
+        return key
+
+    def get(self, path: str, settings: Dict = None) -> Dict:
+        """Return the cached detection results of a file, can be empty."""
+        return self.entries.get(self.key(path, settings), {})
+
+    def set(self, path: str, settings: Dict = None, **results):
+        """Store detection results of a file."""
+        entry = self.entries.setdefault(self.key(path, settings), {})
+        for key, value in results.items():
+            if isinstance(value, dict):
+                entry.setdefault(key, {}).update(value)
+            else:
+                entry[key] = value
+        entry['time'] = int(time.time())
+        self.changed = True
+
+    def save(self):
+        """Write the cache file, without the least recently stored files.
+
+        The cache is only an optimization: if it cannot be written, nothing
+        is done.
+        """
+        if not self.changed:
+            return
+        if len(self.entries) > self.size:
+            ordered = sorted(self.entries,
+                             key=lambda key: self.entries[key]['time'])
+            for key in ordered[:len(self.entries) - self.size]:
+                del self.entries[key]
+
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as file:
+                json.dump({'version': self.version, 'entries': self.entries},
+                          file)
+            os.replace(tmp, self.path)
+        except OSError:
+            with suppress(OSError):
+                os.remove(tmp)
+            return
+        self.changed = False
@@ -4,8 +4,8 @@
 #
 
 import os
-import re
-from typing import Dict, List
+from functools import lru_cache
+from typing import Callable, Dict, List
 from collections import defaultdict
 
 # Cleaning variables.
@@ -23,18 +23,82 @@ CLEANS = {
 }
 
 
+class Cleaner:
+    """Compiled form of the cleaning variables.
+
+    Each character mapping is compiled once into a ``str.translate`` table for
+    the single characters, the longer strings are still replaced in order.
+    The results are memoized, as the same titles, hosts and urls are often
+    found many times in a password repository.
+
+    A mapping where a replacement could itself be replaced again is applied
+    with :func:`~replaces`, to keep the exact same result.
+
+    """
+    cachesize = 65536
+
+    def __init__(self, separator: str, cleans: Dict[str, str],
+                 protocols: List[str], invalids: List[str]):
+        self.key = (separator, tuple(cleans.items()), tuple(protocols),
+                    tuple(invalids))
+        invalid = dict(zip(invalids, [separator] * len(invalids)))
+        groups = dict(invalid)
+        groups['/'] = os.sep
+        groups['\\'] = os.sep
+
+        self.cmdline = self._compile(cleans)
+        self.convert = self._compile(invalid)
+        self.group = self._compile(groups)
+        self.protocol = self._compile(dict.fromkeys(protocols, ''))
+        self.title = self._compile({'/': separator, '\\': separator})
+
+    @classmethod
+    def _compile(cls, characters: Dict[str, str]) -> Callable[[str], str]:
+        """Compile a character mapping into a memoized function."""
+        characters = dict(characters)
+        singles = {k: v for k, v in characters.items() if len(k) == 1}
+        longs = {k: v for k, v in characters.items() if len(k) > 1}
+        values = ''.join(characters.values())
+        unsafe = '' in characters or any(key in values for key in characters)
+        if longs:
+            chars = set(''.join(singles) + values)
+            unsafe |= any(set(key) & chars for key in longs)
+
+        if unsafe:
+            def clean(string):
+                return replaces(characters, string)
+        else:
+            table = str.maketrans(singles)
+
+            def clean(string):
+                return replaces(longs, string).translate(table)
+        return lru_cache(maxsize=cls.cachesize)(clean)
+
+
+_CLEANER = None
+
+
+def cleaner() -> Cleaner:
+    """Return the cleaner compiled from the current cleaning variables."""
+    global _CLEANER  # pylint: disable=global-statement
+    key = (SEPARATOR, tuple(CLEANS.items()), tuple(PROTOCOLS),
+           tuple(INVALIDS))
+    if _CLEANER is None or _CLEANER.key != key:
+        _CLEANER = Cleaner(SEPARATOR, CLEANS, PROTOCOLS, INVALIDS)
+    return _CLEANER
+
+
 def cmdline(string: str, cleans: Dict[str, str] = None) -> str:
     """Make the string more command line friendly."""
     if not cleans:
-        cleans = CLEANS
+        return cleaner().cmdline(string)
 
     return replaces(cleans, string)
 
 
 def convert(string: str) -> str:
     """Convert invalid characters by the separator in a string."""
-    characters = dict(zip(INVALIDS, [SEPARATOR] * len(INVALIDS)))
-    return replaces(characters, string)
+    return cleaner().convert(string)
 
 
 def domain(string: str) -> str:
@@ -47,28 +111,26 @@ def domain(string: str) -> str:
 
 def group(string: str) -> str:
     """Remove invalids characters in a group. Convert sep to os.sep."""
-    characters = dict(zip(INVALIDS, [SEPARATOR] * len(INVALIDS)))
-    characters['/'] = os.sep
-    characters['\\'] = os.sep
-    return replaces(characters, string)
+    return cleaner().group(string)
 
 
 def cpath(entry: Dict[str, str], path: str, cmdclean: bool, conv: bool) -> str:
     """Create path from title and group."""
     ptitle = ''
+    cleans = cleaner()
     for key in ['title', 'host', 'url', 'login']:
         if key in entry and entry[key]:
             ptitle = entry[key]
             if key in ['title', 'host', 'url']:
-                ptitle = protocol(ptitle)
+                ptitle = cleans.protocol(ptitle)
                 if key in ['host', 'url']:
                     ptitle = domain(ptitle)
 
-            ptitle = title(ptitle)
+            ptitle = cleans.title(ptitle)
             if cmdclean:
-                ptitle = cmdline(ptitle)
+                ptitle = cleans.cmdline(ptitle)
             if conv:
-                ptitle = convert(ptitle)
+                ptitle = cleans.convert(ptitle)
             if ptitle != '':
                 if os.path.basename(path) != ptitle:
                     path = os.path.join(path, ptitle)
@@ -80,24 +142,35 @@ def cpath(entry: Dict[str, str], path: str, cmdclean: bool, conv: bool) -> str:
     return path
 
 
-def dpaths(data: List[Dict[str, str]], cmdclean: bool, conv: bool):
-    """Create subfolders for duplicated paths."""
-    duplicated = defaultdict(list)
-    for idx, entry in enumerate(data):
-        path = entry.get('path', '')
-        duplicated[path].append(idx)
+def dpaths(data: List[Dict[str, str]], cmdclean: bool, conv: bool,
+           rounds: int = 1):
+    """Create subfolders for duplicated paths.
 
-    for path in duplicated:
-        if len(duplicated[path]) > 1:
-            for idx in duplicated[path]:
+    The paths are indexed once. Every round only looks again at the paths
+    that received an entry during the previous round, as they are the only
+    ones that can still be duplicated.
+    """
+    index = defaultdict(list)
+    for idx, entry in enumerate(data):
+        index[entry.get('path', '')].append(idx)
+
+    paths = list(index)
+    for _ in range(rounds):
+        groups = [(path, index.pop(path)) for path in paths
+                  if len(index.get(path, [])) > 1]
+        touched = {}
+        for path, indexes in groups:
+            for idx in indexes:
                 entry = data[idx]
                 entry['path'] = cpath(entry, path, cmdclean, conv)
+                index[entry['path']].append(idx)
+                touched[entry['path']] = None
+        paths = list(touched)
 
 
 def protocol(string: str) -> str:
     """Remove the protocol prefix in a string."""
-    characters = dict(zip(PROTOCOLS, [''] * len(PROTOCOLS)))
-    return replaces(characters, string)
+    return cleaner().protocol(string)
 
 
 def replaces(characters: Dict[str, str], string: str) -> str:
@@ -109,8 +182,7 @@ def replaces(characters: Dict[str, str], string: str) -> str:
 
 def title(string: str) -> str:
     """Clean the title from separator before addition to a path."""
-    characters = {'/': SEPARATOR, '\\': SEPARATOR}
-    return replaces(characters, string)
+    return cleaner().title(string)
 
 
 def unused(entry: Dict[str, str]) -> Dict[str, str]:
@@ -122,26 +194,23 @@ def unused(entry: Dict[str, str]) -> Dict[str, str]:
 
 
 def duplicate(data: List[Dict[str, str]]):
-    """Add number to the remaining duplicated path."""
+    """Add number to the remaining duplicated path.
+
+    The number of every base path is remembered, so that a new duplicate
+    starts looking for a free path from the last number given.
+    """
     seen = set()
+    counters = {}
     for entry in data:
-        idx_added = False
         path = entry.get('path', '')
         if path in seen:
-            idx = 1
-            while path in seen:
-                if not idx_added:
-                    path += SEPARATOR + str(idx)
-                    idx_added = True
-                else:
-                    path = re.sub(rf'^(.*){SEPARATOR}{idx}$',
-                                  rf'\1{SEPARATOR}{idx + 1}',
-                                  path)
-                    idx += 1
-            seen.add(path)
+            idx = counters.get(path, 1)
+            while f"{path}{SEPARATOR}{idx}" in seen:
+                idx += 1
+            counters[path] = idx + 1
+            path = f"{path}{SEPARATOR}{idx}"
             entry['path'] = path
-        else:
-            seen.add(path)
+        seen.add(path)
 
 
 def otp(data: List[Dict[str, str]]):
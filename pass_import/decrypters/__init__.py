@@ -1 +1,21 @@
-from pass_import.decrypters.gpg import GPG
+# -*- encoding: utf-8 -*-
+# pass import - Passwords importer swiss army knife
+# Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
+#
+"""The decrypters are imported from their module only when they are used."""
+
+from importlib import import_module
+
+_MODULES = {
+    'GPG': 'gpg',
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    """Import a class from its module, on first use."""
+    if name in _MODULES:
+        module = import_module(f'{__name__}.{_MODULES[name]}')
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,7 +3,7 @@
 # Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
 #
 
-from typing import List
+from typing import FrozenSet, List, Union
 from abc import abstractmethod
 
 from pass_import.core import Asset, Cap
@@ -55,3 +55,41 @@ class Formatter(Detecter):
     @abstractmethod
     def header(cls):
         """Common interface to get format header."""
+
+    def gettree(self):
+        """Data decoded by :func:`is_format`, to be reused by the importer.
+
+        :return: ``None`` if there is nothing to reuse.
+        """
+        return None
+
+    def settree(self, tree):
+        """Reuse the data decoded while detecting the format."""
+
+    @classmethod
+    def prefilter(cls, head: bytes) -> bool:
+        """Cheap check of the beginning of a file, before :func:`is_format`.
+
+        :param bytes head: The first bytes of the file, without BOM and
+            leading whitespaces.
+        :return bool: ``False`` if the file cannot be in the format.
+            Default: ``True``.
+        """
+        return True
+
+    @classmethod
+    def signature(cls) -> FrozenSet:
+        """Normalized header signature of the pm, used to index the pm.
+
+        A file can only be in the pm format if the signature of the pm is a
+        subset of the signature of the file. Default: no signature.
+        """
+        return frozenset()
+
+    def filesignature(self) -> Union[FrozenSet, None]:
+        """Header signature of the file, once recognised by :func:`is_format`.
+
+        :return: ``None`` if the format does not support signatures, then all
+            the pm of the format are candidates.
+        """
+        return None
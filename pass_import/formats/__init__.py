@@ -1,6 +1,27 @@
-from pass_import.formats.csv import CSV
-from pass_import.formats.json import JSON
-from pass_import.formats.kdbx import KDBX
-from pass_import.formats.otp import OTP
-from pass_import.formats.xml import HTML, XML
-from pass_import.formats.yaml import YAML
+# -*- encoding: utf-8 -*-
+# pass import - Passwords importer swiss army knife
+# Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
+#
+"""The formats are imported from their module only when they are used."""
+
+from importlib import import_module
+
+_MODULES = {
+    'CSV': 'csv',
+    'JSON': 'json',
+    'KDBX': 'kdbx',
+    'OTP': 'otp',
+    'HTML': 'xml',
+    'XML': 'xml',
+    'YAML': 'yaml',
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    """Import a class from its module, on first use."""
+    if name in _MODULES:
+        module = import_module(f'{__name__}.{_MODULES[name]}')
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
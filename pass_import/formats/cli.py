@@ -17,6 +17,7 @@ class CLI(PasswordImporter, PasswordExporter):
     """Base class for CLI based importer and exporter."""
     cap = Cap.IMPORT | Cap.EXPORT
     format = 'cli'
+    streamable = True
     command = ''
 
     def __init__(self, prefix=None, settings=None):
@@ -52,6 +53,9 @@ class CLI(PasswordImporter, PasswordExporter):
         command.extend(arg)
         res, stdout, stderr = self._call(command, data, nline)
         if res:
+            if isinstance(stderr, bytes):
+                stderr = stderr.decode(errors='replace')
+                stdout = stdout.decode(errors='replace')
             raise PMError(f"{stderr} {stdout}")
         return stdout
 
@@ -59,9 +63,13 @@ class CLI(PasswordImporter, PasswordExporter):
         """Nothing to do."""
         return True
 
-    @abstractmethod
     def parse(self):
         """Parse the password manager repository and retrieve passwords."""
+        self.data.extend(self._entries())
+
+    @abstractmethod
+    def _entries(self):
+        """Yield the password entries from the password manager."""
 
     @abstractmethod
     def insert(self, entry):
@@ -22,6 +22,7 @@ class CSV(Formatter, PasswordImporter):
     """
     cap = Cap.FORMAT | Cap.IMPORT
     format = 'csv'
+    streamable = True
     csv_header = ''
     fieldnames: List = []
     quotechar = '"'
@@ -31,6 +32,10 @@ class CSV(Formatter, PasswordImporter):
 
     def parse(self):
         """Parse CSV based file."""
+        self.data.extend(self._entries())
+
+    def _entries(self):
+        """Read the CSV file one row at a time."""
         fields = None if not self.fieldnames else self.fieldnames
         self.reader = csv.DictReader(self.file,
                                      fieldnames=fields,
@@ -45,7 +50,7 @@ class CSV(Formatter, PasswordImporter):
             for col in row:
                 entry[keys.get(col, col)] = row.get(col, None)
 
-            self.data.append(entry)
+            yield entry
 
     # Format recognition methods
 
@@ -103,6 +108,11 @@ class CSV(Formatter, PasswordImporter):
             return False
         return True
 
+    @classmethod
+    def prefilter(cls, head):
+        """A CSV file is not binary and does not start as JSON or XML."""
+        return b'\x00' not in head and not head.startswith((b'{', b'[', b'<'))
+
     def checkheader(self, header: List, only: bool = False) -> bool:
         """Ensure the file header is the same than the pm header."""
         try:
@@ -120,5 +130,17 @@ class CSV(Formatter, PasswordImporter):
         """Header for CSV file."""
         return cls.keys.values()
 
+    @classmethod
+    def signature(cls):
+        """Set of the CSV columns of the pm."""
+        return frozenset(cls.header())
+
+    def filesignature(self):
+        """Set of the CSV columns of the file."""
+        try:
+            return frozenset(self.reader.fieldnames or [])
+        except csv.Error:
+            return None
+
 
 register_detecters(CSV)
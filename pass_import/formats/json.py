@@ -23,6 +23,12 @@ class JSON(Formatter, PasswordImporter):
         """Parse JSON based file."""
         raise NotImplementedError()
 
+    def _load(self):
+        """Return the decoded JSON file, it is decoded only once."""
+        if self.jsons is None:
+            self.jsons = json.loads(self.file.read())
+        return self.jsons
+
     # Format recognition methods
 
     def is_format(self) -> bool:
@@ -33,6 +39,19 @@ class JSON(Formatter, PasswordImporter):
             return False
         return True
 
+    def gettree(self):
+        """Decoded JSON file."""
+        return self.jsons
+
+    def settree(self, tree):
+        """Reuse the decoded JSON file."""
+        self.jsons = tree
+
+    @classmethod
+    def prefilter(cls, head):
+        """A JSON file starts with an object or an array."""
+        return head.startswith((b'{', b'['))
+
     def _ensureheader(self, data, header) -> bool:
         """Ensure the data is in the header format.
 
@@ -73,5 +92,19 @@ class JSON(Formatter, PasswordImporter):
         """Header for JSON file."""
         return cls.json_header
 
+    @classmethod
+    def signature(cls):
+        """Set of the top level keys of the pm JSON header."""
+        header = cls.header()
+        if isinstance(header, dict):
+            return frozenset(header)
+        return frozenset()
+
+    def filesignature(self):
+        """Set of the top level keys of the JSON file."""
+        if isinstance(self.jsons, dict):
+            return frozenset(self.jsons)
+        return frozenset()
+
 
 register_detecters(JSON)
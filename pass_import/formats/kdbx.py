@@ -35,6 +35,7 @@ class KDBX(Formatter, PasswordImporter, PasswordExporter):
     name = 'keepass'
     format = 'kdbx'
     magic = b'\x03\xd9\xa2\x9a'
+    mode = 'rb'
     keys = {'login': 'username', 'comments': 'notes', 'group': 'path'}
     attributes = {
         'title', 'username', 'password', 'url', 'notes', 'icon', 'tags',
@@ -232,7 +233,8 @@ class KDBX(Formatter, PasswordImporter, PasswordExporter):
 
     def detecter_open(self):
         """Enter the tryformat context manager."""
-        self.file = open(self.prefix, 'rb')
+        if self.file is None:
+            self.file = open(self.prefix, self.mode)
 
     def detecter_close(self):
         """Leave the tryformat context manager."""
@@ -245,6 +247,11 @@ class KDBX(Formatter, PasswordImporter, PasswordExporter):
             return False
         return True
 
+    @classmethod
+    def prefilter(cls, head):
+        """A KDBX file starts with its magic bytes."""
+        return head.startswith(cls.magic)
+
     def checkheader(self, header, only=False) -> bool:
         """No header check."""
         return True
@@ -3,16 +3,14 @@
 # Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
 #
 
-from xml.parsers.expat import ExpatError
+from xml.parsers.expat import ExpatError, ParserCreate
 
 try:
     from defusedxml import ElementTree
     from defusedxml.ElementTree import ParseError
-    from defusedxml.minidom import parse
 except ImportError:
     from xml.etree import ElementTree
     from xml.etree.ElementTree import ParseError
-    from xml.dom.minidom import parse
 
 from pass_import.core import Cap, register_detecters
 from pass_import.detecter import Formatter
@@ -20,6 +18,53 @@ from pass_import.errors import FormatError
 from pass_import.manager import PasswordImporter
 
 
+class _PrologEnd(Exception):
+    """Raised by the prolog parser to stop at the root start tag."""
+
+
+def prolog(file, chunksize=65536):
+    """Read the doctype and the root tag of an XML file.
+
+    The file is read by chunk and the parsing stops at the root start tag, so
+    no tree is built. The doctype is formatted as by ``minidom``, without its
+    internal subset.
+
+    :return tuple: ``(doctype, root)``, ``doctype`` is empty if there is none.
+    :raise ExpatError: If the prolog is not valid XML.
+    :raise ValueError: If the prolog declares entities.
+    """
+    res = {'doctype': '', 'root': None}
+
+    def doctype(name, sysid, pubid, has_internal_subset):
+        res['doctype'] = f"<!DOCTYPE {name}"
+        if pubid:
+            res['doctype'] += f"  PUBLIC '{pubid}'  '{sysid}'"
+        elif sysid:
+            res['doctype'] += f"  SYSTEM '{sysid}'"
+        if has_internal_subset:
+            res['doctype'] += " []"
+        res['doctype'] += ">"
+
+    def entity(*args):
+        raise ValueError("XML entities are not supported.")
+
+    def start(name, attrs):
+        res['root'] = name
+        raise _PrologEnd()
+
+    parser = ParserCreate()
+    parser.StartDoctypeDeclHandler = doctype
+    parser.EntityDeclHandler = entity
+    parser.StartElementHandler = start
+    try:
+        for chunk in iter(lambda: file.read(chunksize), ''):
+            parser.Parse(chunk, False)
+        parser.Parse('', True)
+    except _PrologEnd:
+        pass
+    return res['doctype'], res['root']
+
+
 class XML(Formatter, PasswordImporter):
     """Base class for XML based importers.
 
@@ -28,9 +73,11 @@ class XML(Formatter, PasswordImporter):
     """
     cap = Cap.FORMAT | Cap.IMPORT
     format = 'xml'
+    streamable = True
     xml_header = {}
     tree = None
-    dom = None
+    doctype = None
+    rootname = None
 
     # Import methods
 
@@ -52,34 +99,50 @@ class XML(Formatter, PasswordImporter):
         return entry
 
     def _import(self, element, path=''):
-        """Import method for XML based importer."""
+        """Import method for XML based importer, yield the entries."""
         raise NotImplementedError()
 
     def parse(self):
         """Parse XML based file."""
-        self.tree = ElementTree.XML(self.file.read())
+        self.data.extend(self._entries())
+
+    def _entries(self):
+        """Yield the entries of the XML file."""
+        try:
+            self.tree = ElementTree.XML(self.file.read())
+        except ParseError as error:
+            raise FormatError(error) from error
         if not self.checkheader(self.header()):
             raise FormatError()
         root = self._getroot(self.tree)
-        self._import(root)
+        yield from self._import(root)
 
     # Format recognition methods
 
     def is_format(self):
-        """Return True if the file is an XML file."""
+        """Return True if the file is an XML file.
+
+        Only the prolog of the file is read, the file is fully parsed by the
+        importer.
+        """
         try:
-            self.dom = parse(self.file)
-        except (ParseError, ExpatError, UnicodeDecodeError):
+            self.doctype, self.rootname = prolog(self.file)
+        except (ExpatError, ValueError, UnicodeDecodeError):
             return False
         return True
 
+    @classmethod
+    def prefilter(cls, head):
+        """An XML file starts with a tag, a declaration or a doctype."""
+        return head.startswith(b'<')
+
     def checkheader(self, header, only=False):
         """Ensure the file header is the same than the pm header."""
-        if self.dom:
-            if self.dom.doctype:
-                if self.dom.doctype.toxml() != header.get('doctype', ''):
+        if self.rootname:
+            if self.doctype:
+                if self.doctype != header.get('doctype', ''):
                     return False
-            if self.dom.documentElement.tagName != header.get('root', ''):
+            if self.rootname != header.get('root', ''):
                 return False
         elif self.tree.tag != header.get('root', ''):
             return False
@@ -90,6 +153,21 @@ class XML(Formatter, PasswordImporter):
         """Header for XML file."""
         return cls.xml_header
 
+    @classmethod
+    def signature(cls):
+        """XML root tag of the pm.
+
+        The doctype is optional in the files, it is only compared by
+        :func:`~checkheader`.
+        """
+        return frozenset({('root', cls.header().get('root', ''))})
+
+    def filesignature(self):
+        """XML root tag of the file."""
+        if not self.rootname:
+            return None
+        return frozenset({('root', self.rootname)})
+
 
 class HTML(Formatter, PasswordImporter):
     """Base class for HTML based importers."""
@@ -107,17 +185,30 @@ class HTML(Formatter, PasswordImporter):
     # Format recognition methods
 
     def is_format(self):
-        """Return True if the file is an HTML file."""
+        """Return True if the file is an HTML file.
+
+        Only the prolog of the file is read, the tree is built by
+        :func:`checkheader`.
+        """
         try:
-            self.tree = ElementTree.XML(self.file.read())
-            if self.tree.tag != 'html':
-                return False
-        except (ParseError, ExpatError):
+            _, rootname = prolog(self.file)
+        except (ExpatError, ValueError, UnicodeDecodeError):
             return False
-        return True
+        return rootname == 'html'
+
+    @classmethod
+    def prefilter(cls, head):
+        """An HTML file starts with a tag, a declaration or a doctype."""
+        return head.startswith(b'<')
 
     def checkheader(self, header, only=False):
         """Ensure the file header is the same than the pm header."""
+        if self.tree is None:
+            self.file.seek(0)
+            try:
+                self.tree = ElementTree.XML(self.file.read())
+            except (ParseError, ExpatError):
+                return False
         found = self.tree.find(header)
         if found is None:
             return False
@@ -128,5 +219,13 @@ class HTML(Formatter, PasswordImporter):
         """Header for HTML file."""
         return cls.html_header
 
+    def gettree(self):
+        """HTML tree."""
+        return self.tree
+
+    def settree(self, tree):
+        """Reuse the HTML tree."""
+        self.tree = tree
+
 
 register_detecters(XML, HTML)
@@ -3,6 +3,8 @@
 # Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
 #
 
+import re
+
 import yaml
 
 from pass_import.core import Cap, register_detecters
@@ -21,6 +23,7 @@ class YAML(Formatter, PasswordImporter):
     """
     cap = Cap.FORMAT | Cap.IMPORT
     format = 'yaml'
+    streamable = True
     yml_format = {}
     yamls = None
     rootkey = ''
@@ -29,7 +32,12 @@ class YAML(Formatter, PasswordImporter):
 
     def parse(self):
         """Parse YAML based file."""
-        self.yamls = yaml.safe_load(self.file)
+        self.data.extend(self._entries())
+
+    def _entries(self):
+        """Yield the entries of the YAML file."""
+        if self.yamls is None:
+            self.yamls = yaml.safe_load(self.file)
         if not self.checkheader(self.header()):
             raise FormatError()
 
@@ -39,7 +47,7 @@ class YAML(Formatter, PasswordImporter):
             for key, value in block.items():
                 if value:
                     entry[keys.get(key, key)] = value
-            self.data.append(entry)
+            yield entry
 
     # Format recognition methods
 
@@ -54,6 +62,29 @@ class YAML(Formatter, PasswordImporter):
             return False
         return True
 
+    def gettree(self):
+        """Decoded YAML document."""
+        return self.yamls
+
+    def settree(self, tree):
+        """Reuse the decoded YAML document."""
+        self.yamls = tree
+
+    @classmethod
+    def prefilter(cls, head):
+        """The first YAML node of the file must look like a mapping."""
+        if b'\x00' in head:
+            return False
+        for line in head.splitlines():
+            line = line.strip()
+            if line.startswith(b'---'):
+                line = line[3:].strip()
+            if not line or line.startswith((b'#', b'%')):
+                continue
+            return line.startswith((b'{', b'?')) or \
+                re.match(rb'[^:]*:(\s|$)', line) is not None
+        return True
+
     def checkheader(self, header, only=False):
         """Ensure the file header is the same than the pm header."""
         for key, value in header.items():
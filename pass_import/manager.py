@@ -8,7 +8,7 @@ from typing import Dict
 from abc import abstractmethod
 
 from pass_import import clean
-from pass_import.audit import Audit
+from pass_import.audit import Audit, AuditCache, PwnedCache
 from pass_import.core import Asset, Cap
 
 
@@ -80,14 +80,36 @@ class PasswordImporter(PasswordManager):
     :param dict keys: Correspondence dictionary between the password-store key
         name (``password``, ``title``, ``login``...), and the key name from the
         password manager considered.
+    :param bool streamable: ``True`` if :func:`~parse` only stores the entries
+        from :func:`~_entries`, so that they can be streamed. A manager that
+        overrides :func:`~parse` to process ``data`` must set it to ``False``.
 
     """
     cap = Cap.IMPORT
+    streamable = False
 
     @abstractmethod
     def parse(self):
         """Parse the password manager repository and retrieve passwords."""
 
+    def iter_entries(self):
+        """Parse the password manager repository and yield the passwords.
+
+        If the importer is ``streamable``, the entries are yielded one by one,
+        without being stored in ``data``. Otherwise, the whole repository is
+        parsed first and the entries are yielded from ``data``.
+
+        """
+        if self.streamable:
+            yield from self._entries()
+        else:
+            self.parse()
+            yield from self.data
+
+    def _entries(self):
+        """Generator of the password entries, for the importers that stream."""
+        raise NotImplementedError()
+
     def invkeys(self) -> Dict[str, str]:
         """Return the invert of ``keys``."""
         return {v: k for k, v in self.keys.items()}
@@ -121,8 +143,14 @@ class PasswordExporter(PasswordManager):
     :param bool force: Either or not to force the insert if the path already
         exist. Default: ``False``
 
+    **Exporter metadata**
+
+    :param bool threadsafe: ``True`` if :func:`~insert` can be called from
+        several threads at the same time. Default: ``False``
+
     """
     cap = Cap.EXPORT
+    threadsafe = False
 
     def __init__(self, prefix=None, settings=None):
         settings = {} if settings is None else settings
@@ -161,12 +189,13 @@ class PasswordExporter(PasswordManager):
             path = clean.group(clean.protocol(entry.pop('group', '')))
             entry['path'] = clean.cpath(entry, path, cmdclean, convert)
 
-        clean.dpaths(self.data, cmdclean, convert)
-        clean.dpaths(self.data, cmdclean, convert)
+        clean.dpaths(self.data, cmdclean, convert, rounds=2)
         clean.duplicate(self.data)
         clean.otp(self.data)
 
-    def audit(self, hibp: bool = False):
+    def audit(self, hibp: bool = False, jobs: int = 8,
+              cache: PwnedCache = None, dataset: str = None,
+              results: AuditCache = None):
         """Audit the parsed password for vulnerable passwords.
 
         **Features:**
@@ -177,12 +206,22 @@ class PasswordExporter(PasswordManager):
 
         :param bool hibp: A flag, to set to ``True`` to look for breached
             password from haveibeenpwned.com
+        :param int jobs: Number of requests to haveibeenpwned.com to run in
+            parallel.
+        :param PwnedCache cache: Optional cache of the hash ranges downloaded
+            from haveibeenpwned.com.
+        :param str dataset: Optional path to a local Pwned Passwords dataset,
+            to look for breached password offline.
+        :param AuditCache results: Optional cache of the previous audit
+            results. Only the passwords not already in it are audited.
         :returns dict: A report dict.
 
         """
-        audit = Audit(self.data)
+        audit = Audit(self.data, results)
         if hibp:
-            audit.password()
+            audit.password(jobs, cache, dataset)
         audit.zxcvbn()
         audit.duplicates()
+        if results is not None:
+            results.save()
         return audit.report
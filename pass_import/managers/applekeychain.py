@@ -130,7 +130,9 @@ class AppleKeychain(Formatter, PasswordImporter):
 
     def parse(self):
         """Parse apple-keychain format by converting it in yaml first."""
-        yamls = self.keychain2yaml(self.file)
+        if self.yamls is None:
+            self.yamls = self.keychain2yaml(self.file)
+        yamls = self.yamls
         keys = self.invkeys()
         for block in yamls:
             entry = {}
@@ -161,15 +163,29 @@ class AppleKeychain(Formatter, PasswordImporter):
             return False
         return True
 
+    @classmethod
+    def prefilter(cls, head):
+        """A keychain dump starts with the keychain path."""
+        return head.startswith(b'keychain:')
+
     def checkheader(self, header, only=False):
         """Check keychain format."""
-        if isinstance(self.yamls, list):
-            self.yamls = self.yamls[0]
+        yamls = self.yamls
+        if isinstance(yamls, list):
+            yamls = yamls[0]
         for yamlkey in header:
-            if yamlkey not in self.yamls:
+            if yamlkey not in yamls:
                 return False
         return True
 
+    def gettree(self):
+        """Keychain converted to YAML."""
+        return self.yamls
+
+    def settree(self, tree):
+        """Reuse the keychain converted to YAML."""
+        self.yamls = tree
+
     @classmethod
     def header(cls):
         """Get keychain format header."""
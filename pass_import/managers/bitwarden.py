@@ -3,8 +3,6 @@
 # Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
 #
 
-import json
-
 from pass_import.core import register_managers
 from pass_import.formats.csv import CSV
 from pass_import.formats.json import JSON
@@ -85,7 +83,7 @@ class BitwardenJSON(JSON):
 
     def parse(self):
         """Parse Bitwarden JSON file."""
-        jsons = json.loads(self.file.read())
+        jsons = self._load()
         keys = self.invkeys()
         folders = {}
         for item in jsons.get(self.key_group, {}):
@@ -3,8 +3,6 @@
 # Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
 #
 
-import json
-
 from pass_import.core import register_managers
 from pass_import.formats.csv import CSV
 from pass_import.formats.json import JSON
@@ -13,6 +11,7 @@ from pass_import.formats.json import JSON
 class BlurCSV(CSV):
     """Importer for Blur in CSV format."""
     name = 'blur'
+    streamable = False
     secure = False
     default = False
     url = 'https://abine.com'
@@ -62,7 +61,7 @@ class BlurJSON(JSON):
 
     def parse(self):
         """Parse Blur JSON file."""
-        jsons = json.loads(self.file.read())
+        jsons = self._load()
         keys = self.invkeys()
 
         items = []
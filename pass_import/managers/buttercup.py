@@ -10,6 +10,7 @@ from pass_import.formats.csv import CSV
 class Buttercup(CSV):
     """Importer for Buttercup in CSV format."""
     name = 'buttercup'
+    streamable = False
     url = 'https://buttercup.pw'
     hexport = 'File > Export > Export File to CSV'
     himport = 'pass import buttercup file.csv'
@@ -27,8 +27,9 @@ class ClipperzHTML(HTML):
     def parse(self):
         """Parse Clipperz HTML+JSON file."""
         # Extract the json from the html file.
-        tree = ElementTree.XML(self.file.read())
-        found = tree.find(self.html_header)
+        if self.tree is None:
+            self.tree = ElementTree.XML(self.file.read())
+        found = self.tree.find(self.html_header)
         if found is None:
             raise FormatError()
 
@@ -28,6 +28,7 @@ class GenericCSV(CSV, PasswordExporter):
     """
     cap = Cap.IMPORT | Cap.EXPORT
     name = 'csv'
+    streamable = False
     himport = "pass import csv file.csv --cols 'url,login,,password'"
     writer = None
 
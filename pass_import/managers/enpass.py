@@ -4,7 +4,6 @@
 #
 
 import csv
-import json
 
 from pass_import.core import register_managers
 from pass_import.errors import FormatError
@@ -15,6 +14,7 @@ from pass_import.formats.json import JSON
 class Enpass(CSV):
     """Importer for Enpass in CSV format."""
     name = 'enpass'
+    streamable = False
     default = False
     url = 'https://www.enpass.io'
     hexport = 'File > Export > As CSV'
@@ -102,7 +102,7 @@ class Enpass6(JSON):
 
     def parse(self):
         """Parse Enpass 6 JSON file."""
-        jsons = json.loads(self.file.read())
+        jsons = self._load()
         keys = self.invkeys()
         folders = {}
         for item in jsons.get('folders', {}):
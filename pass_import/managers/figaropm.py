@@ -30,7 +30,7 @@ class FigaroPM(XML):
     def _import(self, element, path=''):
         for xmlentry in element.findall('PasswordItem'):
             entry = self._getentry(xmlentry)
-            self.data.append(entry)
+            yield entry
 
 
 class Kedpm(FigaroPM):
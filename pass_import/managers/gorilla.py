@@ -13,6 +13,7 @@ from pass_import.formats.csv import CSV
 class Gorilla(CSV):
     """Importer for Gorilla in CSV format."""
     name = 'gorilla'
+    streamable = False
     url = 'https://github.com/zdia/gorilla/wiki'
     hexport = 'File > Export: Yes: CSV Files'
     himport = 'pass import gorilla file.csv'
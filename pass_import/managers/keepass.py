@@ -78,11 +78,11 @@ class KeepassXML(XML):
     def _import(self, element, path=''):
         path = self._getpath(element, path)
         for group in element.findall(self.group):
-            self._import(group, path)
+            yield from self._import(group, path)
         for xmlentry in element.findall(self.entry):
             entry = self._getentry(xmlentry)
             entry['group'] = path
-            self.data.append(entry)
+            yield entry
 
 
 register_managers(Keepass, KeepassCSV, KeepassXML)
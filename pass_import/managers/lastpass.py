@@ -129,15 +129,14 @@ class LastpassCLI(CLI):
             entry['url'] = ''
         return entry
 
-    def parse(self):
+    def _entries(self):
         """Parse Lastpass repository using lpass."""
         uniqueids = self.list(self.root)
         if not uniqueids:
             raise FormatError('empty password store.')
 
         for uniqueid in uniqueids:
-            entry = self.show(uniqueid)
-            self.data.append(entry)
+            yield self.show(uniqueid)
 
     # Export methods
 
@@ -209,6 +208,7 @@ class LastpassCLI(CLI):
 class LastpassCSV(CSV):
     """Importer for Lastpass in CSV format."""
     name = 'lastpass'
+    streamable = False
     default = False
     url = 'https://www.lastpass.com'
     hexport = 'More Options > Advanced > Export'
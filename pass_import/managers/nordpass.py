@@ -10,6 +10,7 @@ from pass_import.core import register_managers
 class NordPassCSV(CSV):
     """Importer for Nord Pass in CSV format."""
     name = 'nordpass'
+    streamable = False
     url = 'https://nordpass.com/'
     hexport = 'Settings > Export Items'
     himport = 'pass import nordpass file.csv'
@@ -109,9 +109,15 @@ class OnePassword4PIF(JSON):
         cleaned = json.dumps(json.loads(cleaned, strict=False))
         return json.loads(cleaned)
 
+    def _load(self):
+        """Return the decoded PIF file, it is decoded only once."""
+        if self.jsons is None:
+            self.jsons = self.pif2json(self.file)
+        return self.jsons
+
     def parse(self):
         """Parse PIF based file."""
-        jsons = self.pif2json(self.file)
+        jsons = self._load()
         keys = self.invkeys()
         folders = {}
         for item in jsons:
@@ -12,6 +12,7 @@ from pass_import.formats.csv import CSV
 class PadlockCSV(CSV):
     """Importer for Padloc CSV format."""
     name = 'padlock'
+    streamable = False
     url = 'https://padloc.app'
     hexport = 'Settings > Export Data and copy text into a .csv file'
     himport = 'pass import padlock file.csv'
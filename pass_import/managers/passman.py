@@ -3,7 +3,6 @@
 # Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
 #
 
-import json
 import os
 
 from pass_import.clean import replaces
@@ -15,6 +14,7 @@ from pass_import.formats.json import JSON
 class PassmanCSV(CSV):
     """Importer for Passman in CSV format."""
     name = 'passman'
+    streamable = False
     url = 'https://passman.cc'
     hexport = 'Settings > Export credentials  > Export type: CSV'
     himport = 'pass import passman file.csv'
@@ -69,7 +69,7 @@ class PassmanJSON(JSON):
         """Parse Passman JSON file."""
         ignore = {'custom_fields', 'icon', 'tags'}
         keys = self.invkeys()
-        jsons = json.loads(self.file.read())
+        jsons = self._load()
         for item in jsons:
             entry = {}
             if item['tags']:
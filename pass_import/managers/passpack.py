@@ -12,6 +12,7 @@ from pass_import.formats.csv import CSV
 class Passpack(CSV):
     """Importer for Passpack in CSV format."""
     name = 'passpack'
+    streamable = False
     url = 'https://www.passpack.com'
     hexport = 'Settings > Export > Save to CSV'
     keys = {
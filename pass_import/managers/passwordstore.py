@@ -3,14 +3,21 @@
 # Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
 #
 
+import hashlib
+import hmac
+import json
 import os
+import re
 import shutil
-from pathlib import Path
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from pass_import.core import Cap, register_detecters, register_managers
 from pass_import.detecter import Formatter
 from pass_import.errors import FormatError, PMError
 from pass_import.formats.cli import CLI
+from pass_import.tools import get_cachedir, get_secret
 
 
 class PasswordStore(CLI, Formatter):
@@ -25,6 +32,17 @@ class PasswordStore(CLI, Formatter):
 
     :param dict env: Environment variables used by ``pass``.
 
+    **Set by reading settings**
+
+    :param bool native: Encrypt and decrypt the entries directly with ``gpg``
+        instead of calling ``pass`` for each of them. Default: ``False``
+    :param int jobs: Number of entries to decrypt in parallel. Default: ``1``
+    :param int batch: In native mode, number of entries per git commit. If
+        ``0``, all the entries are committed at once when the store is closed.
+        Default: ``0``
+    :param bool incremental: Only write the entries that changed since they
+        were last imported. Default: ``False``
+
     """
     cap = Cap.FORMAT | Cap.IMPORT | Cap.EXPORT
     name = 'pass'
@@ -34,7 +52,18 @@ class PasswordStore(CLI, Formatter):
     himport = 'pass import pass path/to/store'
 
     def __init__(self, prefix=None, settings=None):
+        settings = {} if settings is None else settings
         self._gpgbinary = shutil.which('gpg2') or shutil.which('gpg')
+        self._gpgids = {}
+        self._lock = threading.Lock()
+        self._gitrepo = None
+        self.native = settings.get('native', False)
+        self.jobs = settings.get('jobs', 1)
+        self.batch = settings.get('batch', 0)
+        self._staged = []
+        self.incremental = settings.get('incremental', False)
+        self._manifest = None
+        self._manifest_changed = False
         super().__init__(prefix, settings)
         self._setenv('PASSWORD_STORE_DIR')
         self._setenv('PASSWORD_STORE_KEY')
@@ -66,6 +95,11 @@ class PasswordStore(CLI, Formatter):
     def prefix(self, value):
         self.env['PASSWORD_STORE_DIR'] = value
 
+    @property
+    def threadsafe(self):
+        """Concurrent inserts are safe unless ``pass`` commits them to git."""
+        return self.native or not self._isgit()
+
     # Import methods
 
     def list(self, path=''):
@@ -75,22 +109,29 @@ class PasswordStore(CLI, Formatter):
         :return list: Return the list of paths in a store.
 
         """
-        prefix = Path(self.prefix) / path
-        if Path(str(prefix) + '.gpg').is_file():
-            paths = [path]
-        else:
-            paths = []
-            hiddens = []
-            for ppath in prefix.rglob('.*'):
-                if ppath.is_dir():
-                    hiddens.extend(list(ppath.rglob('*.gpg')))
-                else:
-                    hiddens.append(ppath)
-            for ppath in prefix.rglob('*.gpg'):
-                if ppath in hiddens:
-                    continue
-                passname = ppath.relative_to(self.prefix).with_suffix('')
-                paths.append(str(passname))
+        prefix = os.path.join(self.prefix, path)
+        if path and os.path.isfile(prefix + '.gpg'):
+            return [path]
+
+        # Hidden files and directories (.git, .extensions, ...) are pruned
+        # while walking, so they are never scanned. As with glob, the
+        # symlinks to directories are not followed.
+        paths = []
+        stack = [prefix]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.name.startswith('.'):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith('.gpg') and entry.is_file():
+                            passname = os.path.relpath(entry.path,
+                                                       self.prefix)
+                            paths.append(passname[:-len('.gpg')])
+            except OSError:
+                continue
         paths.sort()
         return paths
 
@@ -104,12 +145,14 @@ class PasswordStore(CLI, Formatter):
         entry = {}
         entry['group'] = os.path.dirname(path)
         entry['title'] = os.path.basename(path)
+        content = self._decrypt(path)
         try:
-            data = self._command(['show', path]).split('\n')
+            text = content.decode()
         except UnicodeDecodeError:
-            entry['data'] = self._command(['show', path], nline=False)
+            entry['data'] = content
             return entry
 
+        data = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
         data.pop()
         if data:
             line = data.pop(0)
@@ -128,19 +171,56 @@ class PasswordStore(CLI, Formatter):
                 entry['comments'] += '\n' + line
         return entry
 
-    def parse(self):
+    def _decrypt(self, path):
+        """Decrypt a password file and return its raw content.
+
+        In native mode, ``<prefix>/<path>.gpg`` is decrypted with gpg directly,
+        otherwise ``pass show`` is used. In both cases the file is decrypted
+        only once, the decoding is left to the caller.
+
+        :param str path: Path to the password entry to decrypt.
+        :return bytes: The decrypted content.
+        :raise PMError: If the decryption fails.
+        """
+        if not self.native:
+            return self._command(['show', path], nline=False)
+
+        passfile = self._passfile(path)
+        cmd = [self._gpgbinary, '--decrypt'] + self._gpgopts()
+        cmd.extend(['--', passfile])
+        res, stdout, stderr = self._call(cmd, nline=False)
+        if res:
+            raise PMError(f"{stderr.decode()} {stdout.decode()}")
+        return stdout
+
+    def _entries(self):
         """Parse a password-store repository."""
-        paths = self.list()
+        if self.root and os.path.isdir(os.path.join(self.prefix, self.root)):
+            paths = self.list(self.root)
+        else:
+            paths = self.list()
+            if not paths:
+                raise FormatError('empty password store.')
+            paths = [path for path in paths if self.root in path]
         if not paths:
-            raise FormatError('empty password store.')
-        for path in paths:
-            if self.root not in path:
-                continue
-            try:
-                entry = self.show(path)
-            except PMError as error:  # pragma: no cover
-                raise FormatError(error) from error
-            self.data.append(entry)
+            return
+
+        try:
+            # Decrypt a first entry alone, so that the gpg-agent asks for the
+            # passphrase once, before the others are decrypted in parallel.
+            yield self.show(paths[0])
+
+            # Only a few entries are decrypted ahead of the consumer.
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                pending = deque()
+                for path in paths[1:]:
+                    pending.append(executor.submit(self.show, path))
+                    if len(pending) > 2 * self.jobs:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+        except PMError as error:  # pragma: no cover
+            raise FormatError(error) from error
 
     # Export methods
 
@@ -165,13 +245,19 @@ class PasswordStore(CLI, Formatter):
 
         If ``PasswordManager.force`` is true, it will overwrite previous entry.
 
+        If ``PasswordStore.incremental`` is true, an entry written by a
+        previous import is only overwritten if its content changed, and is
+        silently skipped otherwise.
+
         If the 'data' key is present, the entry is considered as a binary
         attachment and return the binary data.
 
         """
         path = os.path.join(self.root, entry.get('path'))
-        if not self.force:
-            if os.path.isfile(os.path.join(self.prefix, path + '.gpg')):
+        passfile = self._passfile(path)
+        tracked = self.incremental and self._tracked(path)
+        if not (self.force or tracked):
+            if os.path.isfile(passfile):
                 raise PMError(f"An entry already exists for {path}.")
 
         if 'data' in entry:
@@ -195,8 +281,267 @@ class PasswordStore(CLI, Formatter):
                         continue
                     data += f"{key}: {value}\n"
 
-        arg = ['insert', '--multiline', '--force', '--', path]
-        return self._command(arg, data)
+        if self.incremental:
+            digest = self._digest(path, data)
+            if tracked and self._manifest[path][0] == digest:
+                return None
+
+        if self.native:
+            res = self._insert(path, data)
+        else:
+            arg = ['insert', '--multiline', '--force', '--', path]
+            res = self._command(arg, data)
+
+        if self.incremental:
+            self._track(path, digest)
+        return res
+
+    def _passfile(self, path):
+        """Return the password file of a path in the store.
+
+        As ``pass`` does, a path that could go outside of the password store
+        is refused.
+
+        :param str path: Path to the password entry in the store.
+        :raise PMError: If the path is absolute or has a ``..`` component.
+        """
+        if os.path.isabs(path) or '..' in path.replace(os.sep, '/').split('/'):
+            raise PMError(f"sneaky path refused: {path}.")
+        return os.path.join(self.prefix, path + '.gpg')
+
+    def _gpgid(self, path):
+        """Return the GPG recipients of a path in the store.
+
+        As ``pass`` does, the recipients are read from the nearest ``.gpg-id``
+        file found in the parent directories of ``path``, unless
+        ``PASSWORD_STORE_KEY`` is set. If ``PASSWORD_STORE_SIGNING_KEY`` is
+        set, the ``.gpg-id`` file signature is verified. The result is cached
+        per directory.
+
+        :param str path: Path to the password entry in the store.
+        :return list: The list of GPG recipients.
+        :raise PMError: If no ``.gpg-id`` file is found, or if its signature
+            is invalid.
+        """
+        if self.env.get('PASSWORD_STORE_KEY'):
+            return self.env['PASSWORD_STORE_KEY'].split()
+
+        prefix = os.path.normpath(self.prefix)
+        current = os.path.dirname(os.path.join(prefix, path))
+        visited = []
+        while current not in self._gpgids:
+            visited.append(current)
+            gpgidpath = os.path.join(current, '.gpg-id')
+            if os.path.isfile(gpgidpath):
+                self._verify(gpgidpath)
+                # As pass does: comments are removed, then the file is split
+                # on whitespace.
+                gpgids = []
+                with open(gpgidpath, 'r') as file:
+                    for line in file:
+                        gpgids.extend(line.split('#', 1)[0].split())
+                self._gpgids[current] = gpgids
+                break
+            if current == prefix or os.path.dirname(current) == current:
+                raise PMError(f"no .gpg-id found for {path}.")
+            current = os.path.dirname(current)
+
+        for directory in visited:
+            self._gpgids[directory] = self._gpgids[current]
+        return self._gpgids[current]
+
+    def _verify(self, path):
+        """Verify the signature of a file, as ``pass`` does.
+
+        The file must be signed in ``<path>.sig`` by one of the keys in
+        ``PASSWORD_STORE_SIGNING_KEY``. Nothing is verified if it is not set.
+
+        :param str path: Path to the file to verify.
+        :raise PMError: If the signature does not exist or is invalid.
+        """
+        keys = self.env.get('PASSWORD_STORE_SIGNING_KEY', '').split()
+        if not keys:
+            return
+        if not os.path.isfile(path + '.sig'):
+            raise PMError(f"signature for {path} does not exist.")
+
+        cmd = [self._gpgbinary]
+        cmd.extend(self.env.get('PASSWORD_STORE_GPG_OPTS', '').split())
+        cmd.extend(['--verify', '--status-fd=1', path + '.sig', path])
+        _, stdout, _ = self._call(cmd)
+        fingerprints = set()
+        for line in stdout.splitlines():
+            fields = line.split()
+            if fields[:2] == ['[GNUPG:]', 'VALIDSIG']:
+                fingerprints.update([fields[2], fields[-1]])
+        for key in keys:
+            if re.fullmatch('[A-F0-9]{40}', key) and key in fingerprints:
+                return
+        raise PMError(f"signature for {path} is invalid.")
+
+    def _gpgopts(self):
+        """Return the gpg options used by ``pass``."""
+        opts = self.env.get('PASSWORD_STORE_GPG_OPTS', '').split()
+        return opts + ['--quiet', '--yes', '--compress-algo=none',
+                       '--no-encrypt-to', '--batch']
+
+    def _umask(self):
+        """Return the umask used by ``pass`` to create new files."""
+        return int(self.env.get('PASSWORD_STORE_UMASK', '077'), 8)
+
+    def _insert(self, path, data):
+        """Encrypt data with gpg and write it to ``<prefix>/<path>.gpg``.
+
+        This is a drop-in replacement for ``pass insert``: the file is
+        encrypted for the same recipients, with the same gpg options. It does
+        not start a shell nor a ``pass`` process. If the store is a git
+        repository, the file is staged to be committed with the other entries
+        of the same batch.
+
+        :param str path: Path to the password entry in the store.
+        :param data: Data to encrypt, either a ``str`` or ``bytes``.
+        :raise PMError: If the encryption fails.
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        cmd = [self._gpgbinary, '--encrypt']
+        for gpgid in self._gpgid(path):
+            cmd.extend(['-r', gpgid])
+        cmd.extend(self._gpgopts())
+        res, stdout, stderr = self._call(cmd, data, nline=False)
+        if res:
+            raise PMError(f"{stderr.decode()} {stdout.decode()}")
+
+        passfile = self._passfile(path)
+        umask = self._umask()
+        os.makedirs(os.path.dirname(passfile), mode=0o777 & ~umask,
+                    exist_ok=True)
+        tmpfile = f"{passfile}.{os.getpid()}.tmp"
+        fd = os.open(tmpfile, os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                     0o666 & ~umask)
+        with os.fdopen(fd, 'wb') as file:
+            file.write(stdout)
+        os.replace(tmpfile, passfile)
+
+        self._stage(passfile, path)
+
+    # Git methods
+
+    def _git(self, arg):
+        """Call git in the password store repository."""
+        cmd = ['git', '-C', self.prefix]
+        cmd.extend(arg)
+        res, stdout, stderr = self._call(cmd)
+        if res:
+            raise PMError(f"{stderr} {stdout}")
+        return stdout
+
+    def _isgit(self):
+        """Return ``True`` if the password store is in a git repository.
+
+        Git is asked the same way it is run for the commits, so that
+        ``GIT_DIR`` (from ``PASSWORD_STORE_GIT``), ``.git`` files (worktrees,
+        submodules) and parent repositories are supported. The result is
+        cached.
+        """
+        if self._gitrepo is None:
+            try:
+                res, _, _ = self._call(['git', '-C', self.prefix, 'rev-parse',
+                                        '--git-dir'])
+            except OSError:
+                res = 1
+            self._gitrepo = res == 0
+        return self._gitrepo
+
+    def _git_commit(self, paths, message):
+        """Add paths to the git index and commit them, as ``pass`` does."""
+        res, stdout, _ = self._call(['git', '-C', self.prefix, 'config',
+                                     '--bool', '--get', 'pass.signcommits'])
+        sign = ['-S'] if res == 0 and stdout.strip() == 'true' else []
+        for idx in range(0, len(paths), 1000):
+            self._git(['add', '--'] + paths[idx:idx + 1000])
+        self._git(['commit'] + sign + ['-m', message])
+
+    def _stage(self, passfile, path):
+        """Stage a new password file, commit it if the batch is full."""
+        if not self._isgit():
+            return
+        with self._lock:
+            self._staged.append((passfile, path))
+            if self.batch and len(self._staged) >= self.batch:
+                self._commit()
+
+    def _commit(self):
+        """Commit all the staged password files in a single commit.
+
+        A single entry is committed with the same message than ``pass
+        insert``. It must be called with the lock held.
+        """
+        if not self._staged:
+            return
+        if len(self._staged) == 1:
+            message = f"Add given password for {self._staged[0][1]} to store."
+        else:
+            message = f"Import {len(self._staged)} passwords to store."
+        self._git_commit([passfile for passfile, _ in self._staged], message)
+        self._staged = []
+
+    # Manifest methods
+
+    def _manifestpath(self):
+        """Return the path of the manifest of this password store."""
+        prefix = os.path.realpath(self.prefix).encode()
+        name = hashlib.sha256(prefix).hexdigest()
+        return os.path.join(get_cachedir(), 'manifest', name + '.json')
+
+    def _passstat(self, path):
+        """Return the modification time and size of a password file."""
+        try:
+            stat = os.stat(self._passfile(path))
+        except FileNotFoundError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _digest(self, path, data):
+        """Return the keyed hash of an entry content and its recipients."""
+        if isinstance(data, str):
+            data = data.encode()
+        recipients = ' '.join(self._gpgid(path)).encode()
+        return hmac.new(get_secret(), recipients + b'\0' + data,
+                        hashlib.sha256).hexdigest()
+
+    def _tracked(self, path):
+        """Return ``True`` if path was written by a previous import.
+
+        The password file must not have been modified since then.
+        """
+        with self._lock:
+            if self._manifest is None:
+                self._manifest = {}
+                manifestpath = self._manifestpath()
+                if os.path.isfile(manifestpath):
+                    with open(manifestpath, 'r') as file:
+                        self._manifest = json.load(file)
+        state = self._manifest.get(path)
+        return state is not None and state[1:] == self._passstat(path)
+
+    def _track(self, path, digest):
+        """Record the content hash and the file state of a new entry."""
+        self._manifest[path] = [digest] + self._passstat(path)
+        self._manifest_changed = True
+
+    def _save_manifest(self):
+        """Write the manifest back to disk, if it changed."""
+        if not self._manifest_changed:
+            return
+        manifestpath = self._manifestpath()
+        os.makedirs(os.path.dirname(manifestpath), mode=0o700, exist_ok=True)
+        tmpfile = f"{manifestpath}.{os.getpid()}.tmp"
+        fd = os.open(tmpfile, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as file:
+            json.dump(self._manifest, file)
+        os.replace(tmpfile, manifestpath)
+        self._manifest_changed = False
 
     # Context manager methods
 
@@ -264,7 +609,10 @@ class PasswordStore(CLI, Formatter):
             raise PMError(f"{self.prefix} is not a password repository.")
 
     def close(self):
-        """There is no file to close."""
+        """Commit the remaining staged password files and save the manifest."""
+        with self._lock:
+            self._commit()
+            self._save_manifest()
 
     # Format recognition methods
 
@@ -42,7 +42,7 @@ class Pwsafe(XML):
                     xmlkey, value = self._getvalue(hist)
                     xmlkey += historyentry.attrib.get('num', '')
                     entry[xmlkey] = value
-            self.data.append(entry)
+            yield entry
 
 
 register_managers(Pwsafe)
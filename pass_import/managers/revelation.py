@@ -52,7 +52,7 @@ class Revelation(XML):
         for xmlentry in element.findall('entry'):
             if xmlentry.attrib.get('type', '') == 'folder':
                 _path = os.path.join(path, xmlentry.find('name').text)
-                self._import(xmlentry, _path)
+                yield from self._import(xmlentry, _path)
             else:
                 entry = self._getentry(xmlentry)
                 entry['group'] = path
@@ -72,7 +72,7 @@ class Revelation(XML):
                     else:
                         entry['host'] = domain
 
-                self.data.append(entry)
+                yield entry
 
 
 register_managers(Revelation)
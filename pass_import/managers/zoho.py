@@ -12,6 +12,7 @@ from pass_import.formats.csv import CSV
 class ZohoCSV(CSV):
     """Importer for Zoho in CSV format."""
     name = 'zoho'
+    streamable = False
     url = 'https://www.zoho.com/vault'
     hexport = 'Tools > Export Secrets: Zoho Vault Format CSV'
     himport = 'pass import zoho file.csv'
@@ -35,6 +36,7 @@ class ZohoCSV(CSV):
 class ZohoCSVVault(CSV):
     """Importer for Zoho Vault in CSV format."""
     name = 'zoho'
+    streamable = False
     default = False
     url = 'https://www.zoho.com/vault'
     hexport = 'Tools > Export Secrets: Zoho Vault Format CSV'
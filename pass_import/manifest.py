@@ -0,0 +1,1095 @@
+# -*- encoding: utf-8 -*-
+# pass import - Passwords importer swiss army knife
+# Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
+#
+"""Manifest of the password managers and detecters.
+
+Generated by ``make manifest``, do not edit manually.
+"""
+
+MANAGERS = [{'module': 'pass_import.managers.aegis',
+  'cls': 'Aegis',
+  'format': 'json',
+  'cap': 10,
+  'name': 'aegis',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://github.com/beemdevelopment/Aegis',
+  'hexport': 'Settings> Tools: Export Plain',
+  'himport': 'pass import aegis file.json',
+  'header': {'version': 1,
+             'header': {'slots': None, 'params': None},
+             'db': {'version': 1,
+                    'entries': [{'type': str,
+                                 'uuid': str,
+                                 'name': str,
+                                 'issuer': str,
+                                 'info': {'secret': str,
+                                          'algo': str,
+                                          'digits': int}}]}},
+  'signature': ['db', 'header', 'version']},
+ {'module': 'pass_import.managers.aegis',
+  'cls': 'AegisCipher',
+  'format': 'json',
+  'cap': 10,
+  'name': 'aegis',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://github.com/beemdevelopment/Aegis',
+  'hexport': 'Settings> Tools: Export encrypted',
+  'himport': 'pass import aegis file.json',
+  'header': {'version': 1,
+             'header': {'slots': [{'type': int,
+                                   'uuid': str,
+                                   'key': str,
+                                   'key_params': dict}],
+                        'params': {'nonce': str, 'tag': str}},
+             'db': str},
+  'signature': ['db', 'header', 'version']},
+ {'module': 'pass_import.managers.andotp',
+  'cls': 'AndOTP',
+  'format': 'json',
+  'cap': 10,
+  'name': 'andotp',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://github.com/andOTP/andOTP',
+  'hexport': 'Backups> Backup plain',
+  'himport': 'pass import andotp file.json',
+  'header': [{'secret': str,
+              'label': str,
+              'digits': int,
+              'type': str,
+              'algorithm': str,
+              'thumbnail': str,
+              'last_used': int,
+              'tags': list}],
+  'signature': []},
+ {'module': 'pass_import.managers.applekeychain',
+  'cls': 'AppleKeychain',
+  'format': 'keychain',
+  'cap': 10,
+  'name': 'apple-keychain',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://support.apple.com/guide/keychain-access',
+  'hexport': 'See this guide: '
+             'https://gist.github.com/santigz/601f4fd2f039d6ceb2198e2f9f4f01e0',
+  'himport': 'pass import applekeychain file.txt',
+  'header': ['version', 'class', 'data', 'attributes'],
+  'signature': []},
+ {'module': 'pass_import.managers.bitwarden',
+  'cls': 'BitwardenCSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'bitwarden',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://bitwarden.com',
+  'hexport': 'Tools> Export Vault> File Format: .csv',
+  'himport': 'pass import bitwarden file.csv',
+  'header': ['name',
+             'login_password',
+             'login_username',
+             'login_uri',
+             'notes',
+             'folder',
+             'login_totp'],
+  'signature': ['folder',
+                'login_password',
+                'login_totp',
+                'login_uri',
+                'login_username',
+                'name',
+                'notes']},
+ {'module': 'pass_import.managers.bitwarden',
+  'cls': 'BitwardenJSON',
+  'format': 'json',
+  'cap': 10,
+  'name': 'bitwarden',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://bitwarden.com',
+  'hexport': 'Tools> Export Vault> File Format: .json',
+  'himport': 'pass import bitwarden file.json',
+  'header': {'encrypted': False,
+             'folders': [{'id': str, 'name': str}],
+             'items': [{'id': str,
+                        'folderId': str,
+                        'type': int,
+                        'name': str,
+                        'favorite': bool}]},
+  'signature': ['encrypted', 'folders', 'items']},
+ {'module': 'pass_import.managers.bitwarden',
+  'cls': 'BitwardenOrgCSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'bitwarden',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://bitwarden.com',
+  'hexport': 'Tools> Export Vault> File Format: .csv',
+  'himport': 'pass import bitwarden file.csv',
+  'header': ['name',
+             'login_password',
+             'login_username',
+             'login_uri',
+             'notes',
+             'collections',
+             'login_totp'],
+  'signature': ['collections',
+                'login_password',
+                'login_totp',
+                'login_uri',
+                'login_username',
+                'name',
+                'notes']},
+ {'module': 'pass_import.managers.bitwarden',
+  'cls': 'BitwardenOrgJSON',
+  'format': 'json',
+  'cap': 10,
+  'name': 'bitwarden',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://bitwarden.com',
+  'hexport': 'Tools> Export Vault> File Format: .json',
+  'himport': 'pass import bitwarden file.json',
+  'header': {'encrypted': False,
+             'collections': list,
+             'items': [{'id': str,
+                        'type': int,
+                        'name': str,
+                        'favorite': bool,
+                        'collectionIds': list}]},
+  'signature': ['collections', 'encrypted', 'items']},
+ {'module': 'pass_import.managers.blur',
+  'cls': 'BlurCSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'blur',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://abine.com',
+  'hexport': 'Settings: Export Data: Export CSV: Accounts: Export CSV',
+  'himport': 'pass import blur file.csv',
+  'header': ['label', 'password', 'username', 'email', 'domain'],
+  'signature': ['domain', 'email', 'label', 'password', 'username']},
+ {'module': 'pass_import.managers.blur',
+  'cls': 'BlurJSON',
+  'format': 'json',
+  'cap': 10,
+  'name': 'blur',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://abine.com',
+  'hexport': 'Settings: Export Data: Export Blur Data',
+  'himport': 'pass import blur file.json',
+  'header': {'dntmeExport': True,
+             'accounts': list,
+             'cards': list,
+             'addresses': list,
+             'notes': list,
+             'identities': list},
+  'signature': ['accounts',
+                'addresses',
+                'cards',
+                'dntmeExport',
+                'identities',
+                'notes']},
+ {'module': 'pass_import.managers.buttercup',
+  'cls': 'Buttercup',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'buttercup',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://buttercup.pw',
+  'hexport': 'File > Export > Export File to CSV',
+  'himport': 'pass import buttercup file.csv',
+  'header': ['title', 'password', 'username', 'URL', 'Notes', '!group_id'],
+  'signature': ['!group_id', 'Notes', 'URL', 'password', 'title', 'username']},
+ {'module': 'pass_import.managers.chrome',
+  'cls': 'ChromeCSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'chrome',
+  'version': '',
+  'default': True,
+  'only': True,
+  'url': 'https://support.google.com/chrome',
+  'hexport': 'In chrome://password-manager/settings under 2Export '
+             'passwordsDownload File',
+  'himport': 'pass import chrome file.csv',
+  'header': ['name', 'password', 'username', 'url', 'note'],
+  'signature': ['name', 'note', 'password', 'url', 'username']},
+ {'module': 'pass_import.managers.chrome',
+  'cls': 'ChromeCSVSQLite',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'chrome',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://support.google.com/chrome',
+  'hexport': 'See this guide: '
+             'https://support.google.com/chrome/answer/95606#see',
+  'himport': 'pass import chrome file.csv',
+  'header': ['display_name', 'password_value', 'username_value', 'origin_url'],
+  'signature': ['display_name',
+                'origin_url',
+                'password_value',
+                'username_value']},
+ {'module': 'pass_import.managers.clipperz',
+  'cls': 'ClipperzHTML',
+  'format': 'html',
+  'cap': 10,
+  'name': 'clipperz',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://clipperz.is',
+  'hexport': 'Settings > Data > Export: HTML + JSON',
+  'himport': 'pass import clipperz file.html',
+  'header': 'body/div/div/textarea',
+  'signature': []},
+ {'module': 'pass_import.managers.dashlane',
+  'cls': 'DashlaneCSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'dashlane',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://www.dashlane.com',
+  'hexport': 'File > Export > Unsecured Archive in CSV',
+  'himport': 'pass import dashlane file.csv',
+  'header': ['title', 'password', 'login', 'url', 'comments'],
+  'signature': ['comments', 'login', 'password', 'title', 'url']},
+ {'module': 'pass_import.managers.dashlane',
+  'cls': 'DashlaneJSON',
+  'format': 'json',
+  'cap': 10,
+  'name': 'dashlane',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://www.dashlane.com',
+  'hexport': 'File > Export > Unsecured Archive in JSON',
+  'himport': 'pass import dashlane file.json',
+  'header': {'AUTHENTIFIANT': list, 'EMAIL': list},
+  'signature': ['AUTHENTIFIANT', 'EMAIL']},
+ {'module': 'pass_import.managers.encryptr',
+  'cls': 'Encryptr',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'encryptr',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://spideroak.com/encryptr',
+  'hexport': 'Compile from source and follow instructions from this guide: '
+             'https://github.com/SpiderOak/Encryptr/issues/295#issuecomment-322449705',
+  'himport': 'pass import encryptr file.csv',
+  'header': ['Entry Type', 'Label', 'Notes'],
+  'signature': ['Entry Type', 'Label', 'Notes']},
+ {'module': 'pass_import.managers.enpass',
+  'cls': 'Enpass',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'enpass',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://www.enpass.io',
+  'hexport': 'File > Export > As CSV',
+  'himport': 'pass import enpass file.csv',
+  'header': ['Title', 'Field', 'Value', 'Field', 'Value', '.........', 'Note'],
+  'signature': ['.........', 'Field', 'Note', 'Title', 'Value']},
+ {'module': 'pass_import.managers.enpass',
+  'cls': 'Enpass6',
+  'format': 'json',
+  'cap': 10,
+  'name': 'enpass',
+  'version': '6',
+  'default': True,
+  'only': False,
+  'url': 'https://www.enpass.io',
+  'hexport': 'Menu > File > Export > As JSON',
+  'himport': 'pass import enpass file.json',
+  'header': {'folders': [{'icon': str,
+                          'parent_uuid': str,
+                          'title': str,
+                          'updated_at': int,
+                          'uuid': str}],
+             'items': [{'auto_submit': int,
+                        'category': str,
+                        'favorite': int,
+                        'fields': [{'label': str, 'type': str, 'value': str}],
+                        'folders': list,
+                        'icon': dict,
+                        'note': str,
+                        'subtitle': str,
+                        'template_type': str,
+                        'title': str,
+                        'uuid': str}]},
+  'signature': ['folders', 'items']},
+ {'module': 'pass_import.managers.figaropm',
+  'cls': 'FigaroPM',
+  'format': 'xml',
+  'cap': 10,
+  'name': 'fpm',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'http://fpm.sourceforge.net',
+  'hexport': 'File > Export Passwords: Plain XML',
+  'himport': 'pass import fpm file.xml',
+  'header': {'root': 'FPM'},
+  'signature': [('root', 'FPM')]},
+ {'module': 'pass_import.managers.firefox',
+  'cls': 'Firefox',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'firefox',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://www.mozilla.org/en-US/firefox/lockwise/',
+  'hexport': 'In about:logins Menu: Export logins',
+  'himport': 'pass import firefox file.csv',
+  'header': ['url',
+             'password',
+             'username',
+             'httpRealm',
+             'formActionOrigin',
+             'timeCreated',
+             'timeLastUsed',
+             'timePasswordChanged',
+             'guid'],
+  'signature': ['formActionOrigin',
+                'guid',
+                'httpRealm',
+                'password',
+                'timeCreated',
+                'timeLastUsed',
+                'timePasswordChanged',
+                'url',
+                'username']},
+ {'module': 'pass_import.managers.firefox',
+  'cls': 'FirefoxPasswordExporter',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'firefox',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://github.com/kspearrin/ff-password-exporter',
+  'hexport': 'Add-ons Prefs: Export Passwords: CSV',
+  'himport': 'pass import firefox file.csv',
+  'header': ['hostname', 'password', 'username'],
+  'signature': ['hostname', 'password', 'username']},
+ {'module': 'pass_import.managers.freeotp',
+  'cls': 'FreeOTPPlus',
+  'format': 'json',
+  'cap': 10,
+  'name': 'freeotp+',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://github.com/helloworld1/FreeOTPPlus',
+  'hexport': 'Settings> Export> Export JSON Format',
+  'himport': 'pass import freeotp+ file.json',
+  'header': {'tokenOrder': list,
+             'tokens': [{'algo': str,
+                         'digits': int,
+                         'issuerExt': str,
+                         'label': str,
+                         'secret': list,
+                         'type': str}]},
+  'signature': ['tokenOrder', 'tokens']},
+ {'module': 'pass_import.managers.csv',
+  'cls': 'GenericCSV',
+  'format': 'csv',
+  'cap': 6,
+  'name': 'csv',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': '',
+  'hexport': '',
+  'himport': "pass import csv file.csv --cols 'url,login,,password'",
+  'header': [],
+  'signature': []},
+ {'module': 'pass_import.managers.gnomeauthenticator',
+  'cls': 'GnomeAuthenticator',
+  'format': 'json',
+  'cap': 10,
+  'name': 'gnome-auth',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://gitlab.gnome.org/World/Authenticator',
+  'hexport': 'Backup > in a plain-text JSON file',
+  'himport': 'pass import gnome-authenticator file.json',
+  'header': [{'secret': str,
+              'label': str,
+              'digits': int,
+              'type': str,
+              'algorithm': str,
+              'thumbnail': str,
+              'last_used': int,
+              'tags': list}],
+  'signature': []},
+ {'module': 'pass_import.managers.gnomekeyring',
+  'cls': 'GnomeKeyring',
+  'format': 'libsecret',
+  'cap': 2,
+  'name': 'gnome',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://wiki.gnome.org/Projects/GnomeKeyring',
+  'hexport': '',
+  'himport': 'pass import gnome-keyring <label>',
+  'header': None,
+  'signature': []},
+ {'module': 'pass_import.managers.gopass',
+  'cls': 'Gopass',
+  'format': 'gopass',
+  'cap': 14,
+  'name': 'gopass',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://www.gopass.pw/',
+  'hexport': '',
+  'himport': 'pass import gopass path/to/store',
+  'header': '',
+  'signature': []},
+ {'module': 'pass_import.managers.gorilla',
+  'cls': 'Gorilla',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'gorilla',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://github.com/zdia/gorilla/wiki',
+  'hexport': 'File > Export: Yes: CSV Files',
+  'himport': 'pass import gorilla file.csv',
+  'header': ['title', 'password', 'user', 'url', 'notes', 'group'],
+  'signature': ['group', 'notes', 'password', 'title', 'url', 'user']},
+ {'module': 'pass_import.managers.figaropm',
+  'cls': 'Kedpm',
+  'format': 'xml',
+  'cap': 10,
+  'name': 'kedpm',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'http://fpm.sourceforge.net',
+  'hexport': 'File > Export Passwords: Plain XML',
+  'himport': 'pass import kedpm file.xml',
+  'header': {'root': 'FPM'},
+  'signature': [('root', 'FPM')]},
+ {'module': 'pass_import.managers.keepass',
+  'cls': 'Keepass',
+  'format': 'kdbx',
+  'cap': 14,
+  'name': 'keepass',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://www.keepass.info',
+  'hexport': '',
+  'himport': 'pass import keepass file.kdbx',
+  'header': '',
+  'signature': []},
+ {'module': 'pass_import.managers.keepass',
+  'cls': 'KeepassCSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'keepass',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://www.keepass.info',
+  'hexport': 'File > Export > Keepass (CSV)',
+  'himport': 'pass import keepass file.csv',
+  'header': ['Account', 'Password', 'Login Name', 'Web Site', 'Comments'],
+  'signature': ['Account', 'Comments', 'Login Name', 'Password', 'Web Site']},
+ {'module': 'pass_import.managers.keepass',
+  'cls': 'KeepassXML',
+  'format': 'xml',
+  'cap': 10,
+  'name': 'keepass',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://www.keepass.info',
+  'hexport': 'File > Export > Keepass (XML)',
+  'himport': 'pass import keepass file.xml',
+  'header': {'root': 'KeePassFile'},
+  'signature': [('root', 'KeePassFile')]},
+ {'module': 'pass_import.managers.keepassx2',
+  'cls': 'Keepassx2CSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'keepassx2',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://www.keepassx.org',
+  'hexport': 'Database > Export to CSV File',
+  'himport': 'pass import keepassx2 file.csv',
+  'header': ['Title', 'Password', 'Username', 'URL', 'Notes', 'Group'],
+  'signature': ['Group', 'Notes', 'Password', 'Title', 'URL', 'Username']},
+ {'module': 'pass_import.managers.keepassx2',
+  'cls': 'Keepassx2KDBX',
+  'format': 'kdbx',
+  'cap': 14,
+  'name': 'keepassx2',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://www.keepassx.org',
+  'hexport': '',
+  'himport': 'pass import keepassx2 file.kdbx',
+  'header': '',
+  'signature': []},
+ {'module': 'pass_import.managers.keepassx',
+  'cls': 'KeepassxXML',
+  'format': 'xml',
+  'cap': 10,
+  'name': 'keepassx',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://www.keepassx.org',
+  'hexport': 'File > Export to > Keepass XML File',
+  'himport': 'pass import keepassx file.xml',
+  'header': {'doctype': '<!DOCTYPE KEEPASSX_DATABASE>', 'root': 'database'},
+  'signature': [('root', 'database')]},
+ {'module': 'pass_import.managers.keepassxc',
+  'cls': 'KeepassxcCSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'keepassxc',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://keepassxc.org',
+  'hexport': 'Database > Export to CSV File',
+  'himport': 'pass import keepassxc file.csv',
+  'header': ['Title', 'Password', 'Username', 'URL', 'Notes', 'Group'],
+  'signature': ['Group', 'Notes', 'Password', 'Title', 'URL', 'Username']},
+ {'module': 'pass_import.managers.keepassxc',
+  'cls': 'KeepassxcKDBX',
+  'format': 'kdbx',
+  'cap': 14,
+  'name': 'keepassxc',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://keepassxc.org',
+  'hexport': '',
+  'himport': 'pass import keepassxc file.kdbx',
+  'header': '',
+  'signature': []},
+ {'module': 'pass_import.managers.keeper',
+  'cls': 'KeeperCSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'keeper',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://keepersecurity.com',
+  'hexport': 'Settings > Export : Export to CSV File',
+  'himport': 'pass import keeper file.csv',
+  'header': ['title', 'password', 'login', 'url', 'comments', 'group'],
+  'signature': ['comments', 'group', 'login', 'password', 'title', 'url']},
+ {'module': 'pass_import.managers.lastpass',
+  'cls': 'LastpassCLI',
+  'format': 'cli',
+  'cap': 6,
+  'name': 'lastpass',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://www.lastpass.com',
+  'hexport': '',
+  'himport': 'pass import lastpass <login>',
+  'header': None,
+  'signature': []},
+ {'module': 'pass_import.managers.lastpass',
+  'cls': 'LastpassCSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'lastpass',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://www.lastpass.com',
+  'hexport': 'More Options > Advanced > Export',
+  'himport': '',
+  'header': ['name', 'password', 'username', 'url', 'extra', 'grouping'],
+  'signature': ['extra', 'grouping', 'name', 'password', 'url', 'username']},
+ {'module': 'pass_import.managers.myki',
+  'cls': 'Myki',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'myki',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://myki.com',
+  'hexport': 'See this guide: '
+             'https://support.myki.com/myki-app/exporting-your-passwords-from-the-myki-app/how-to-export-your-passwords-account-data-from-myki',
+  'himport': 'pass import myki file.csv',
+  'header': ['nickname',
+             'password',
+             'username',
+             'url',
+             'additionalInfo',
+             'twofaSecret'],
+  'signature': ['additionalInfo',
+                'nickname',
+                'password',
+                'twofaSecret',
+                'url',
+                'username']},
+ {'module': 'pass_import.managers.networkmanager',
+  'cls': 'NetworkManager',
+  'format': 'nm',
+  'cap': 10,
+  'name': 'network-manager',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://wiki.gnome.org/Projects/NetworkManager',
+  'hexport': 'Also support specific networkmanager dir and ini file',
+  'himport': 'pass import networkmanager',
+  'header': '',
+  'signature': []},
+ {'module': 'pass_import.managers.nordpass',
+  'cls': 'NordPassCSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'nordpass',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://nordpass.com/',
+  'hexport': 'Settings > Export Items',
+  'himport': 'pass import nordpass file.csv',
+  'header': ['name', 'password', 'username', 'url', 'note', 'folder'],
+  'signature': ['folder', 'name', 'note', 'password', 'url', 'username']},
+ {'module': 'pass_import.managers.onepassword',
+  'cls': 'OnePassword4CSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': '1password',
+  'version': '4',
+  'default': False,
+  'only': True,
+  'url': 'https://1password.com',
+  'hexport': 'See this guide: https://support.1password.com/export',
+  'himport': 'pass import 1password file.csv',
+  'header': ['title', 'password', 'username', 'url', 'notes'],
+  'signature': ['notes', 'password', 'title', 'url', 'username']},
+ {'module': 'pass_import.managers.onepassword',
+  'cls': 'OnePassword4PIF',
+  'format': '1pif',
+  'cap': 10,
+  'name': '1password',
+  'version': '4',
+  'default': False,
+  'only': False,
+  'url': 'https://1password.com',
+  'hexport': 'See this guide: https://support.1password.com/export',
+  'himport': 'pass import 1password file.1pif',
+  'header': {},
+  'signature': []},
+ {'module': 'pass_import.managers.onepassword',
+  'cls': 'OnePassword8CSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': '1password',
+  'version': '8',
+  'default': True,
+  'only': False,
+  'url': 'https://1password.com',
+  'hexport': 'See this guide: https://support.1password.com/export',
+  'himport': 'pass import 1password file.csv',
+  'header': ['Title',
+             'Url',
+             'Username',
+             'Password',
+             'OTPAuth',
+             'Favorite',
+             'Archived',
+             'Tags',
+             'Notes'],
+  'signature': ['Archived',
+                'Favorite',
+                'Notes',
+                'OTPAuth',
+                'Password',
+                'Tags',
+                'Title',
+                'Url',
+                'Username']},
+ {'module': 'pass_import.managers.onepassword',
+  'cls': 'OnePasswordCSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': '1password',
+  'version': '6',
+  'default': False,
+  'only': False,
+  'url': 'https://1password.com',
+  'hexport': 'See this guide: https://support.1password.com/export',
+  'himport': 'pass import 1password file.csv',
+  'header': ['Title', 'Password', 'Username', 'URL', 'Notes', 'Type'],
+  'signature': ['Notes', 'Password', 'Title', 'Type', 'URL', 'Username']},
+ {'module': 'pass_import.managers.padlock',
+  'cls': 'PadlockCSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'padlock',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://padloc.app',
+  'hexport': 'Settings > Export Data and copy text into a .csv file',
+  'himport': 'pass import padlock file.csv',
+  'header': ['name', 'password', 'username', 'url', 'notes', 'tags'],
+  'signature': ['name', 'notes', 'password', 'tags', 'url', 'username']},
+ {'module': 'pass_import.managers.passman',
+  'cls': 'PassmanCSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'passman',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://passman.cc',
+  'hexport': 'Settings > Export credentials  > Export type: CSV',
+  'himport': 'pass import passman file.csv',
+  'header': ['label',
+             'password',
+             'username',
+             'email',
+             'url',
+             'description',
+             'tags'],
+  'signature': ['description',
+                'email',
+                'label',
+                'password',
+                'tags',
+                'url',
+                'username']},
+ {'module': 'pass_import.managers.passman',
+  'cls': 'PassmanJSON',
+  'format': 'json',
+  'cap': 10,
+  'name': 'passman',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://passman.cc',
+  'hexport': 'Settings > Export credentials  > Export type: JSON',
+  'himport': 'pass import passman file.json',
+  'header': [{'credential_id': int,
+              'guid': str,
+              'user_id': str,
+              'label': str,
+              'description': str,
+              'tags': list,
+              'username': str,
+              'password': str,
+              'url': str,
+              'icon': dict,
+              'custom_fields': list,
+              'otp': dict,
+              'compromised': bool}],
+  'signature': []},
+ {'module': 'pass_import.managers.passpack',
+  'cls': 'Passpack',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'passpack',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://www.passpack.com',
+  'hexport': 'Settings > Export > Save to CSV',
+  'himport': '',
+  'header': ['Entry Name',
+             'Password',
+             'User ID',
+             'URL',
+             'Email',
+             'Notes',
+             'Tags'],
+  'signature': ['Email',
+                'Entry Name',
+                'Notes',
+                'Password',
+                'Tags',
+                'URL',
+                'User ID']},
+ {'module': 'pass_import.managers.passpie',
+  'cls': 'Passpie',
+  'format': 'yaml',
+  'cap': 10,
+  'name': 'passpie',
+  'version': '1.0',
+  'default': True,
+  'only': False,
+  'url': 'https://www.enpass.io',
+  'hexport': '`passpie export file.yml`',
+  'himport': 'pass import passpie file.yml',
+  'header': {'handler': 'passpie', 'version': 1.0},
+  'signature': []},
+ {'module': 'pass_import.managers.passwordstore',
+  'cls': 'PasswordStore',
+  'format': 'pass',
+  'cap': 14,
+  'name': 'pass',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://passwordstore.org',
+  'hexport': '',
+  'himport': 'pass import pass path/to/store',
+  'header': '',
+  'signature': []},
+ {'module': 'pass_import.managers.pwsafe',
+  'cls': 'Pwsafe',
+  'format': 'xml',
+  'cap': 10,
+  'name': 'pwsafe',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://pwsafe.org',
+  'hexport': 'File > Export To > XML Format',
+  'himport': 'pass import pwsafe file.xml',
+  'header': {'root': 'passwordsafe'},
+  'signature': [('root', 'passwordsafe')]},
+ {'module': 'pass_import.managers.revelation',
+  'cls': 'Revelation',
+  'format': 'xml',
+  'cap': 10,
+  'name': 'revelation',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://revelation.olasagasti.info',
+  'hexport': 'File > Export: XML',
+  'himport': 'pass import revelation file.xml',
+  'header': {'root': 'revelationdata'},
+  'signature': [('root', 'revelationdata')]},
+ {'module': 'pass_import.managers.roboform',
+  'cls': 'Roboform',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'roboform',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://www.roboform.com',
+  'hexport': 'Roboform > Options > Data & Sync > Export To: CSV file',
+  'himport': 'pass import roboform file.csv',
+  'header': ['Name', 'Pwd', 'Login', 'Url', 'Note', 'Folder'],
+  'signature': ['Folder', 'Login', 'Name', 'Note', 'Pwd', 'Url']},
+ {'module': 'pass_import.managers.safeincloud',
+  'cls': 'SafeInCloudCSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'safeincloud',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://safeincloud.ladesk.com/',
+  'hexport': 'File > Export > Comma-Separated Values (CSV)',
+  'himport': 'pass import safeincloud file.csv',
+  'header': ['Title', 'Login', 'Password', 'URL', 'Notes', 'OTP'],
+  'signature': ['Login', 'Notes', 'OTP', 'Password', 'Title', 'URL']},
+ {'module': 'pass_import.managers.saferpass',
+  'cls': 'SaferPass',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'saferpass',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://saferpass.net',
+  'hexport': 'Settings > Export Data: Export data',
+  'himport': 'pass import saferpass file.csv',
+  'header': ['title',
+             'password',
+             'username',
+             'url',
+             'notes',
+             'favorite',
+             'text',
+             'modelType',
+             'color'],
+  'signature': ['color',
+                'favorite',
+                'modelType',
+                'notes',
+                'password',
+                'text',
+                'title',
+                'url',
+                'username']},
+ {'module': 'pass_import.managers.sphinx',
+  'cls': 'Sphinx',
+  'format': '',
+  'cap': 4,
+  'name': 'sphinx',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://github.com/stef/pwdsphinx/',
+  'hexport': '',
+  'himport': '',
+  'header': None,
+  'signature': []},
+ {'module': 'pass_import.managers.synology',
+  'cls': 'SynologyC2CSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'synology',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'https://c2.synology.com/en-global/password/overview',
+  'hexport': 'Profile > Export > Download',
+  'himport': 'pass import synology file.csv',
+  'header': ['Display_Name',
+             'Login_Username',
+             'Login_Password',
+             'Login_URLs',
+             'Login_TOTP',
+             'Notes'],
+  'signature': ['Display_Name',
+                'Login_Password',
+                'Login_TOTP',
+                'Login_URLs',
+                'Login_Username',
+                'Notes']},
+ {'module': 'pass_import.managers.upm',
+  'cls': 'UPM',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'upm',
+  'version': '',
+  'default': True,
+  'only': False,
+  'url': 'http://upm.sourceforge.net',
+  'hexport': 'Database > Export',
+  'himport': 'pass import upm file.csv',
+  'header': ['title', 'password', 'login', 'url', 'comments'],
+  'signature': ['comments', 'login', 'password', 'title', 'url']},
+ {'module': 'pass_import.managers.zoho',
+  'cls': 'ZohoCSV',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'zoho',
+  'version': '',
+  'default': True,
+  'only': True,
+  'url': 'https://www.zoho.com/vault',
+  'hexport': 'Tools > Export Secrets: Zoho Vault Format CSV',
+  'himport': 'pass import zoho file.csv',
+  'header': ['Secret Name', 'Secret URL', 'Notes'],
+  'signature': ['Notes', 'Secret Name', 'Secret URL']},
+ {'module': 'pass_import.managers.zoho',
+  'cls': 'ZohoCSVVault',
+  'format': 'csv',
+  'cap': 10,
+  'name': 'zoho',
+  'version': '',
+  'default': False,
+  'only': False,
+  'url': 'https://www.zoho.com/vault',
+  'hexport': 'Tools > Export Secrets: Zoho Vault Format CSV',
+  'himport': 'pass import zoho file.csv',
+  'header': ['Secret Name',
+             'Description',
+             'Secret URL',
+             'Notes',
+             'ChamberName',
+             'Tags',
+             'SecretData',
+             'CustomData'],
+  'signature': ['ChamberName',
+                'CustomData',
+                'Description',
+                'Notes',
+                'Secret Name',
+                'Secret URL',
+                'SecretData',
+                'Tags']}]
+
+DETECTERS = [{'module': 'pass_import.managers.applekeychain',
+  'cls': 'AppleKeychain',
+  'format': 'keychain',
+  'cap': 10},
+ {'module': 'pass_import.formats.csv',
+  'cls': 'CSV',
+  'format': 'csv',
+  'cap': 10},
+ {'module': 'pass_import.decrypters.gpg',
+  'cls': 'GPG',
+  'format': 'gpg',
+  'cap': 16},
+ {'module': 'pass_import.formats.xml',
+  'cls': 'HTML',
+  'format': 'html',
+  'cap': 10},
+ {'module': 'pass_import.formats.json',
+  'cls': 'JSON',
+  'format': 'json',
+  'cap': 10},
+ {'module': 'pass_import.formats.kdbx',
+  'cls': 'KDBX',
+  'format': 'kdbx',
+  'cap': 14},
+ {'module': 'pass_import.managers.networkmanager',
+  'cls': 'NetworkManager',
+  'format': 'nm',
+  'cap': 10},
+ {'module': 'pass_import.managers.onepassword',
+  'cls': 'OnePassword4PIF',
+  'format': '1pif',
+  'cap': 10},
+ {'module': 'pass_import.managers.passwordstore',
+  'cls': 'PasswordStore',
+  'format': 'pass',
+  'cap': 14},
+ {'module': 'pass_import.formats.xml',
+  'cls': 'XML',
+  'format': 'xml',
+  'cap': 10},
+ {'module': 'pass_import.formats.yaml',
+  'cls': 'YAML',
+  'format': 'yaml',
+  'cap': 10}]
@@ -3,9 +3,12 @@
 # Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
 #
 
+import contextlib
 import getpass
+import json
 import os
 import sys
+import threading
 from typing import Tuple, Dict, Union
 
 try:
@@ -25,6 +28,32 @@ def getpassword(path, name='Password') -> str:
     return getpass.getpass(f"{name} for {path}: ")
 
 
+def get_cachedir() -> str:
+    """Return the pass-import cache directory."""
+    cache = os.environ.get('XDG_CACHE_HOME', '')
+    if cache == '':
+        cache = os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache, 'pass-import')
+
+
+def get_secret() -> bytes:
+    """Return the local secret used to key the hashes stored in the cache.
+
+    It is randomly generated on first use and never leaves the cache directory.
+    """
+    path = os.path.join(get_cachedir(), 'secret')
+    if not os.path.isfile(path):
+        os.makedirs(get_cachedir(), mode=0o700, exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'wb') as file:
+                file.write(os.urandom(32))
+        except FileExistsError:  # pragma: no cover
+            pass
+    with open(path, 'rb') as file:
+        return file.read()
+
+
 def get_magics(path) -> Tuple[str, str]:
     """Get file format and encoding.
 
@@ -68,6 +97,84 @@ def get_magics(path) -> Tuple[str, str]:
     return frmt, encoding
 
 
+class Journal():
+    """Append-only journal of the password paths already exported.
+
+    It allows an interrupted export to be resumed without inserting the same
+    passwords again. Each path is written on its own line, as soon as it has
+    been exported.
+
+    :param str path: Path to the journal file.
+    :param set done: The paths already present in the journal.
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        self.file = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Read the paths already exported by a previous run."""
+        if not os.path.isfile(self.path):
+            return
+        with open(self.path, 'r') as file:
+            for line in file:
+                try:
+                    self.done.add(json.loads(line))
+                except json.JSONDecodeError:
+                    # The last line may be truncated by a crash.
+                    continue
+
+    def open(self, resume=False):
+        """Open the journal, truncate it unless the export is resumed.
+
+        When resumed, a last line truncated by a crash is terminated, so that
+        the new paths are not appended to it.
+        """
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        self.file = open(self.path, 'a' if resume else 'w')
+        if resume and self.file.tell() > 0:
+            with open(self.path, 'rb') as file:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b'\n':
+                    self.file.write('\n')
+
+    def close(self):
+        """Close the journal."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def remove(self):
+        """Close and delete the journal, once the export is complete."""
+        self.close()
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def add(self, path):
+        """Record an exported path.
+
+        If the journal cannot be written anymore, the export goes on without
+        it.
+        """
+        with self._lock:
+            if self.file is not None:
+                try:
+                    self.file.write(json.dumps(path) + '\n')
+                    self.file.flush()
+                except OSError:
+                    with contextlib.suppress(OSError):
+                        self.file.close()
+                    self.file = None
+            self.done.add(path)
+
+    def __contains__(self, path):
+        """Return ``True`` if path has already been exported."""
+        return path in self.done
+
+
 class Config(dict):
     """Manage configuration, settings, and output messages.
 
@@ -153,6 +260,7 @@ class Config(dict):
 
         if 'separator' in self:
             clean.CLEANS[' '] = self['separator']
+        clean.cleaner()
 
     def currate(self):
         """Generate curated config from pass-import and pimport arguments."""
@@ -169,7 +277,7 @@ class Config(dict):
         settings = {'action': action, 'root': root}
         keep = {
             'all', 'force', 'delimiter', 'cols', '1password', 'lastpass',
-            'key', 'decrypted'
+            'key', 'decrypted', 'native', 'jobs', 'batch', 'incremental'
         }
         for key in self:
             if key in keep:
@@ -5,6 +5,7 @@
 """Generate release, update the readme, man & completion files in this repo."""
 
 import io
+import pprint
 import re
 import subprocess  # nosec
 import sys
@@ -18,7 +19,7 @@ except ImportError:
 
 import pass_import as ext
 from pass_import.__main__ import ArgParser
-from pass_import.core import Cap
+from pass_import.core import Cap, get_detecters
 
 MANAGERS = ext.Managers()
 
@@ -317,6 +318,54 @@ def makedoc():
             file.write(data)
 
 
+class Name():
+    """Write a type by its name in the manifest."""
+
+    def __init__(self, cls):
+        self.cls = cls
+
+    def __repr__(self):
+        return self.cls.__name__
+
+
+def literal(data):
+    """Replace the types in the manager header by their names."""
+    if isinstance(data, type):
+        return Name(data)
+    if isinstance(data, dict):
+        return {key: literal(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [literal(value) for value in data]
+    return data
+
+
+def makemanifest():
+    """Generate the manifest of the password managers and detecters."""
+    managers = [
+        literal(ext.metadata(pm))
+        for pm in sorted(MANAGERS, key=lambda pm: pm.__name__)
+    ]
+    detecters = [
+        ext.metadata(cls, detecter=True)
+        for cls in sorted(get_detecters(), key=lambda cls: cls.__name__)
+    ]
+    header = ('# -*- encoding: utf-8 -*-\n'
+              '# pass import - Passwords importer swiss army knife\n'
+              '# Copyright (C) 2017-2024 Alexandre PUJOL '
+              '<alexandre@pujol.io>.\n'
+              '#\n'
+              '"""Manifest of the password managers and detecters.\n\n'
+              'Generated by ``make manifest``, do not edit manually.\n'
+              '"""\n\n')
+    with open('pass_import/manifest.py', 'w') as file:
+        file.write(header)
+        file.write('MANAGERS = ')
+        file.write(pprint.pformat(managers, width=79, sort_dicts=False))
+        file.write('\n\nDETECTERS = ')
+        file.write(pprint.pformat(detecters, width=79, sort_dicts=False))
+        file.write('\n')
+
+
 def git_add(path: str):
     """Add file contents to the index."""
     subprocess.call(["/usr/bin/git", "add", path], shell=False)  # nosec
@@ -382,8 +431,11 @@ def makerelease():
 if __name__ == "__main__":
     if '--docs' in sys.argv:
         makedoc()
+    elif '--manifest' in sys.argv:
+        makemanifest()
     elif '--release' in sys.argv:
         makerelease()
     else:
-        print('Usage: python share [--docs] | [--release VERSION]')
+        print('Usage: python share [--docs] | [--manifest] | '
+              '[--release VERSION]')
         sys.exit(1)
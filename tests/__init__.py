@@ -171,6 +171,8 @@ def mock_hibp(*args, **kwargs):
             ]
 
             self.text = "\r\n".join(data)
+            self.status_code = 200
+            self.headers = {}
 
         def raise_for_status(self):
             pass
@@ -204,6 +206,9 @@ class Test(unittest.TestCase):
         os.environ.pop('PASSWORD_STORE_SIGNING_KEY', None)
         os.environ['GNUPGHOME'] = os.path.join(os.getcwd(), assets + 'gnupg')
 
+        # Never use the user cache directory
+        os.environ['XDG_CACHE_HOME'] = os.path.join(tmp, 'cache')
+
     # Main related method
 
     def main(self, cmd, code=None, msg=''):
@@ -4,6 +4,8 @@
 #
 
 import os
+import shutil
+from unittest import mock
 
 from pass_import.errors import PMError
 from pass_import.managers.passwordstore import PasswordStore
@@ -155,6 +157,32 @@ class TestExportPassShow(TestPass):
         ref = ['Emails/WS/dpbx@fner.ws', 'Emails/WS/dpbx@mnyfymt.ws']
         self.assertEqual(self.store.list('Emails/WS'), ref)
 
+    def test_pass_list_hidden(self):
+        """Testing: pass list skips hidden files and directories."""
+        self._tmpdir()
+        for path in ['.git/objects/a.gpg', '.extensions/b.gpg', 'c/.d.gpg',
+                     'c/.e/f.gpg', 'c/g.gpg', 'h.gpg', 'i.txt']:
+            os.makedirs(os.path.dirname(os.path.join(self.prefix, path)),
+                        exist_ok=True)
+            open(os.path.join(self.prefix, path), 'w').close()
+        store = PasswordStore(self.prefix)
+        self.assertEqual(store.list(), ['c/g', 'h'])
+        self.assertEqual(store.list('c'), ['c/g'])
+        self.assertEqual(store.list('nothing'), [])
+
+    def test_pass_list_symlinks(self):
+        """Testing: pass list does not follow the directory symlinks."""
+        self._tmpdir()
+        store, outside = [os.path.join(self.prefix, name)
+                          for name in ('store', 'outside')]
+        os.makedirs(os.path.join(store, 'a'))
+        os.makedirs(outside)
+        open(os.path.join(store, 'a', 'x.gpg'), 'w').close()
+        open(os.path.join(outside, 'y.gpg'), 'w').close()
+        os.symlink(os.path.join(store, 'a'), os.path.join(store, 'a', 'loop'))
+        os.symlink(outside, os.path.join(store, 'shared'))
+        self.assertEqual(PasswordStore(store).list(), ['a/x'])
+
     def test_pass_show(self):
         """Testing: pass show Social/mastodon.social."""
         path = "Social/mastodon.social"
@@ -188,6 +216,39 @@ class TestExportPassShow(TestPass):
 
         self.assertEqual(self.store.show(path), entry)
 
+    def test_pass_show_native(self):
+        """Testing: native show is the same as pass show."""
+        store = PasswordStore(self.prefix, settings={'native': True})
+        for path in self.store.list():
+            self.assertEqual(store.show(path), self.store.show(path))
+
+    def test_pass_show_native_emptypassword(self):
+        """Testing: native show 'CornerCases/empty password'."""
+        path = "CornerCases/empty password"
+        entry = {'group': 'CornerCases',
+                 'login': 'vkeelpbu',
+                 'title': 'empty password',
+                 'url': 'nhysdo.wg'}
+        store = PasswordStore(self.prefix, settings={'native': True})
+        self.assertEqual(store.show(path), entry)
+
+    def test_pass_parse_jobs(self):
+        """Testing: parse with parallel decryption keeps the list order."""
+        store = PasswordStore(self.prefix, settings={'jobs': 4})
+        store.parse()
+        paths = [os.path.join(entry['group'], entry['title'])
+                 for entry in store.data]
+        self.assertEqual(paths, self.store.list())
+
+    def test_pass_parse_root(self):
+        """Testing: parse only decrypts the entries under root."""
+        store = PasswordStore(self.prefix, settings={'root': 'Emails/WS',
+                                                     'native': True})
+        store.parse()
+        paths = [os.path.join(entry['group'], entry['title'])
+                 for entry in store.data]
+        self.assertEqual(paths, self.store.list('Emails/WS'))
+
 
 class TestExportPassBinary(TestPass):
     """Test pass with binary files."""
@@ -202,3 +263,180 @@ class TestExportPassBinary(TestPass):
 
         entry2 = self.store.show('pass.png')
         self.assertEqual(entry['data'], entry2['data'])
+
+    def test_pass_binary_error(self):
+        """Testing: pass insert binary file error message is decoded."""
+        entry = {'data': b'\x89PNG', 'path': 'pass.png'}
+        with mock.patch.object(self.store, '_call',
+                               return_value=(1, b'', b'gpg failed')):
+            with self.assertRaises(PMError) as error:
+                self.store.insert(entry)
+        self.assertEqual(str(error.exception), 'gpg failed ')
+
+
+class TestExportPassNative(TestPass):
+    """Test pass insert with the native gpg backend."""
+
+    def setUp(self):
+        """Create a new password store repository using the native mode."""
+        super().setUp()
+        self.store.native = True
+
+    def test_pass_native_insert(self):
+        """Testing: native insert, readable by pass."""
+        self._init_pass()
+        entry = {'password': 'UuQHzvv6IHRIJGjwKru7', 'login': 'lnqYm3ZWtm',
+                 'url': 'https://twitter.com', 'path': 'Test/test'}
+        ref = ("UuQHzvv6IHRIJGjwKru7\nlogin: lnqYm3ZWtm\n"
+               "url: https://twitter.com\n")
+        self.store.insert(entry)
+        self.assertTrue(os.path.isfile(
+            os.path.join(self.prefix, 'Test', 'test.gpg')))
+        self.assertEqual(self.store._command(['show', 'Test/test']), ref)
+
+    def test_pass_native_gpgid(self):
+        """Testing: native recipients from the nearest .gpg-id."""
+        self._init_pass()
+        os.makedirs(os.path.join(self.prefix, 'Sub'))
+        with open(os.path.join(self.prefix, 'Sub', '.gpg-id'), 'w') as file:
+            file.write('70BD448330ACF0653645B8F2B4DDBFF0D774A374   # key 2\n'
+                       '\tkey1@example.com key2@example.com  \n# comment\n')
+        self.assertEqual(self.store._gpgid('Test/test'),
+                         ['D4C78DB7920E1E27F5416B81CC9DB947CF90C77B'])
+        gpgids = ['70BD448330ACF0653645B8F2B4DDBFF0D774A374',
+                  'key1@example.com', 'key2@example.com']
+        self.assertEqual(self.store._gpgid('Sub/dir/test'), gpgids)
+        self.assertEqual(self.store._gpgids[
+            os.path.join(os.path.normpath(self.prefix), 'Sub', 'dir')],
+            gpgids)
+
+    def test_pass_native_gpgid_signed(self):
+        """Testing: native .gpg-id signature verified with a signing key."""
+        self._init_pass()
+        gpgid = os.path.join(self.prefix, '.gpg-id')
+        self.store.env['PASSWORD_STORE_SIGNING_KEY'] = self.gpgids[0]
+        with self.assertRaises(PMError):
+            self.store._gpgid('Test/test')
+
+        self.store._call([self.store._gpgbinary, '--batch', '--yes',
+                          '--detach-sign', '-u', self.gpgids[0], gpgid])
+        self.assertEqual(self.store._gpgid('Test/test'), [self.gpgids[0]])
+
+        self.store._gpgids.clear()
+        with open(gpgid, 'a') as file:
+            file.write('70BD448330ACF0653645B8F2B4DDBFF0D774A374\n')
+        with self.assertRaises(PMError):
+            self.store._gpgid('Test/test')
+
+    def test_pass_native_sneaky_path(self):
+        """Testing: native insert refuses paths outside of the store."""
+        self._init_pass()
+        self.store.force = True
+        for path in ['../outside/evil', 'Test/../../evil', '/tmp/evil', '..']:
+            with self.subTest(path):
+                with self.assertRaises(PMError):
+                    self.store.insert({'path': path, 'password': 'dummy'})
+        self.assertFalse(os.path.exists(
+            os.path.join(self.prefix, '..', 'outside')))
+
+    def test_pass_native_binary(self):
+        """Testing: native insert & show binary file."""
+        self._init_pass()
+        with open(os.path.join(tests.assets, 'pass.png'), 'rb') as file:
+            data = file.read()
+        entry = {'data': data, 'path': 'pass.png'}
+        self.store.insert(entry)
+        self.assertEqual(self.store.show('pass.png')['data'], data)
+
+    def _init_git(self):
+        """Initialize a git repository in the password store."""
+        self.store._call(['git', 'init', self.prefix])
+        self.store._git(['config', 'user.name', 'pass-import'])
+        self.store._git(['config', 'user.email', 'pass-import@example.com'])
+
+    def test_pass_git_detection(self):
+        """Testing: git store detected from a .git file and from GIT_DIR."""
+        prefix = os.path.join(self.prefix, 'store')
+        gitdir = os.path.join(self.prefix, 'gitdir')
+        os.makedirs(prefix)
+        self.addCleanup(shutil.rmtree, gitdir, ignore_errors=True)
+        store = PasswordStore(prefix)
+        self.assertTrue(store.threadsafe)
+
+        store._gitrepo = None
+        store._call(['git', 'init', '--separate-git-dir', gitdir, prefix])
+        self.assertTrue(os.path.isfile(os.path.join(prefix, '.git')))
+        self.assertFalse(store.threadsafe)
+
+        os.remove(os.path.join(prefix, '.git'))
+        store._gitrepo = None
+        store.env['GIT_DIR'] = gitdir
+        self.assertFalse(store.threadsafe)
+
+    def test_pass_native_git(self):
+        """Testing: native insert commits to git as pass does."""
+        self._init_pass()
+        self._init_git()
+        self.store.insert({'path': 'Test/test', 'password': 'dummy'})
+        self.store.close()
+        log = self.store._git(['log', '--format=%s'])
+        self.assertEqual(log, "Add given password for Test/test to store.\n")
+
+    def test_pass_native_git_single_commit(self):
+        """Testing: native insert makes a single git commit."""
+        self._init_pass()
+        self._init_git()
+        for idx in range(5):
+            self.store.insert({'path': f'Test/test{idx}', 'password': 'dummy'})
+        self.assertEqual(self.store._git(['ls-files']).count('.gpg'), 0)
+        self.store.close()
+        log = self.store._git(['log', '--format=%s'])
+        self.assertEqual(log, "Import 5 passwords to store.\n")
+        self.assertEqual(self.store._git(['ls-files']).count('.gpg'), 5)
+
+    def test_pass_native_git_batch(self):
+        """Testing: native insert with a git commit every 2 entries."""
+        self._init_pass()
+        self._init_git()
+        self.store.batch = 2
+        for idx in range(5):
+            self.store.insert({'path': f'Test/test{idx}', 'password': 'dummy'})
+        self.store.close()
+        log = self.store._git(['log', '--format=%s'])
+        self.assertEqual(log, "Add given password for Test/test4 to store.\n"
+                              "Import 2 passwords to store.\n"
+                              "Import 2 passwords to store.\n")
+
+    def test_pass_native_incremental(self):
+        """Testing: incremental insert only writes the changed entries."""
+        self._init_pass()
+        self.store.incremental = True
+        entry = {'path': 'Test/test', 'password': 'dummy'}
+        self.store.insert(entry)
+        self.store.close()
+        passfile = os.path.join(self.prefix, 'Test', 'test.gpg')
+        mtime = os.stat(passfile).st_mtime_ns
+
+        settings = {'native': True, 'incremental': True}
+        store = PasswordStore(self.prefix, settings=settings)
+        store.insert(entry)
+        self.assertEqual(os.stat(passfile).st_mtime_ns, mtime)
+        store.insert({'path': 'Test/test', 'password': 'changed'})
+        store.close()
+        self.assertEqual(store.show('Test/test')['password'], 'changed')
+
+    def test_pass_native_incremental_modified(self):
+        """Testing: incremental insert does not overwrite modified entries."""
+        self._init_pass()
+        self.store.incremental = True
+        self.store.insert({'path': 'Test/test', 'password': 'dummy'})
+        self.store.insert({'path': 'Test/other', 'password': 'dummy'})
+        self.store.close()
+        os.remove(os.path.join(self.prefix, 'Test', 'test.gpg'))
+        os.rename(os.path.join(self.prefix, 'Test', 'other.gpg'),
+                  os.path.join(self.prefix, 'Test', 'test.gpg'))
+
+        settings = {'native': True, 'incremental': True}
+        store = PasswordStore(self.prefix, settings=settings)
+        with self.assertRaises(PMError):
+            store.insert({'path': 'Test/test', 'password': 'changed'})
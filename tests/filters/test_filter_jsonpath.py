@@ -108,3 +108,54 @@ class TestFilter(tests.Test):
         self.assertTrue(len(paths_imported) == 2)
         self.assertTrue(len(paths_exported) == 1)
         self.assertTrue(data[0]['login'] in paths_exported[0])
+
+    def test_filter_identical_entries(self):
+        """Testing: filter identical entries by identity, not by value."""
+        data = [
+            {'password': 'v_password', 'login': 'v_login', 'tags': ['A']},
+            {'password': 'v_password', 'login': 'v_login', 'tags': ['B']},
+            {'password': 'v_password', 'login': 'v_login', 'tags': ['A']},
+        ]
+        self.conf['filter'] = "$.entries[?(@.tags[0]=='A')]"
+        paths_imported, paths_exported, audit = pass_export(
+            self.conf, MockManager, data
+        )
+        self.assertTrue(len(paths_imported) == 3)
+        self.assertTrue(len(paths_exported) == 2)
+
+    def test_filter_all_entries(self):
+        """Testing: a filter matching the entries list exports them all."""
+        data = [{'login': 'v_login_0'}, {'login': 'v_login_1'}]
+        self.conf['filter'] = "$.entries"
+        paths_imported, paths_exported, audit = pass_export(
+            self.conf, MockManager, data
+        )
+        self.assertTrue(len(paths_exported) == 2)
+
+    def test_filter_before_audit(self):
+        """Testing: the entries excluded by the filter are not audited."""
+        data = [
+            {'password': 'v_password', 'login': 'v_login_0', 'tags': ['A']},
+            {'password': 'v_password', 'login': 'v_login_1', 'tags': ['B']},
+        ]
+        self.conf['filter'] = "$.entries[?(@.tags[0]=='A')]"
+        paths_imported, paths_exported, audit = pass_export(
+            self.conf, MockManager, data
+        )
+        self.assertTrue(len(paths_imported) == 2)
+        self.assertTrue(len(paths_exported) == 1)
+        self.assertEqual(audit['duplicated'], [])
+        self.assertNotIn('path', data[1])
+
+    def test_filter_excluded_none(self):
+        """Testing: excluded entries with no group nor title are reported."""
+        data = [
+            {'password': 'v_password', 'login': 'v_login_0', 'tags': ['A']},
+            {'password': 'v_password', 'group': None, 'title': None},
+        ]
+        self.conf['filter'] = "$.entries[?(@.tags[0]=='A')]"
+        paths_imported, paths_exported, _ = pass_export(
+            self.conf, MockManager, data
+        )
+        self.assertTrue(len(paths_imported) == 2)
+        self.assertTrue(len(paths_exported) == 1)
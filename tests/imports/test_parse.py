@@ -38,6 +38,23 @@ class TestParse(tests.Test):
                     importer.parse()
                     self.assertImport(importer.data, reference, keep)
 
+    @patch("getpass.getpass")
+    def test_imports_iter_entries(self, pw):
+        """Testing: iter_entries yields the same entries than parse."""
+        pw.return_value = self.masterpassword
+        for manager in tests.conf:
+            if not tests.conf[manager].get('parse', True):
+                continue
+            with self.subTest(manager):
+                with tests.cls(manager) as importer:
+                    importer.parse()
+                    reference = importer.data
+                with tests.cls(manager) as importer:
+                    entries = list(importer.iter_entries())
+                    self.assertEqual(entries, reference)
+                    if importer.streamable:
+                        self.assertEqual(importer.data, [])
+
     @patch("getpass.getpass")
     def test_imports_otp(self, pw):
         """Testing: parse method for all OTP importers."""
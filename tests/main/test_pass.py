@@ -4,9 +4,11 @@
 #
 
 import os
+import shutil
 from unittest import mock
 
 import tests
+from pass_import.managers.passwordstore import PasswordStore
 
 
 class TestMainPass(tests.Test):
@@ -123,10 +125,147 @@ class TestMainPass(tests.Test):
     #     cmd = [tests.db + 'lastpass.csv.gpg', '-q']
     #     self.main(cmd)
     
+    def test_main_detect_cache(self):
+        """Testing: pass import db/passpack.csv, twice."""
+        cache = os.path.join(self.prefix, '.cache')
+        cmd = [tests.db + 'passpack.csv', '-f', '-v']
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': cache}):
+            with tests.captured() as (out, _):
+                self.main(cmd)
+                self.assertNotIn('cached detection', out.getvalue())
+            with tests.captured() as (out, _):
+                self.main(cmd)
+                self.assertIn('cached detection result: Passpack.',
+                              out.getvalue())
+        path = os.path.join(cache, 'pass-import', 'detect.json')
+        self.assertTrue(os.path.isfile(path))
+
+    def test_main_detect_cache_unwritable(self):
+        """Testing: pass import db/passpack.csv, no detection cache."""
+        cmd = [tests.db + 'passpack.csv', '-f', '-v', '--native']
+        env = {'XDG_CACHE_HOME': '/dev/null/cache'}
+        with mock.patch.dict(os.environ, env):
+            with tests.captured() as (out, _):
+                self.main(cmd)
+                self.assertIn('Passpack', out.getvalue())
+                self.assertNotIn('cached detection', out.getvalue())
+
     # Test the audit feature.
 
-    @mock.patch('requests.get', tests.mock_hibp)
+    @mock.patch('requests.Session.get', tests.mock_hibp)
     def test_main_audit(self):
         """Testing: pass import db/audit.yml."""
         cmd = [tests.db + 'audit.yml', '--pwned']
         self.main(cmd)
+
+    @mock.patch('requests.Session.get', tests.mock_hibp)
+    def test_main_audit_unwritable(self):
+        """Testing: pass import KeepassXML keepass.xml --pwned, no cache."""
+        cmd = ['KeepassXML', tests.db + 'keepass.xml', '--pwned', '--native']
+        env = {'XDG_CACHE_HOME': '/dev/null/cache'}
+        with mock.patch.dict(os.environ, env):
+            with tests.captured() as (out, _):
+                self.main(cmd)
+                self.assertIn('Unable to write the haveibeenpwned cache',
+                              out.getvalue())
+
+    @mock.patch('requests.Session.get', tests.mock_hibp)
+    def test_main_audit_cache(self):
+        """Testing: pass import db/audit.yml --pwned --audit-cache."""
+        cache = os.path.join(self.prefix, '.cache')
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': cache}):
+            cmd = [tests.db + 'audit.yml', '--pwned', '--audit-cache', '-f']
+            self.main(cmd)
+            self.main(cmd)
+        path = os.path.join(cache, 'pass-import', 'audit.json')
+        self.assertTrue(os.path.isfile(path))
+
+    def test_main_audit_file(self):
+        """Testing: pass import db/audit.yml --pwned-file pwned.txt."""
+        dataset = os.path.join(self.prefix, '.pwned.txt')
+        with open(dataset, 'w') as file:
+            file.write(f'{"0" * 40}:1\n')
+        cmd = [tests.db + 'audit.yml', '--pwned-file', dataset]
+        self.main(cmd)
+
+    # Test the parallel insert feature.
+
+    def test_main_jobs(self):
+        """Testing: pass import keepass db/keepass.xml --native --jobs 4."""
+        cmd = ['keepass', tests.db + 'keepass.xml', '--native', '--jobs', '4',
+               '-q']
+        self.main(cmd)
+        path = os.path.join(self.prefix, 'keepass', 'Social', 'twitter.com')
+        self.assertTrue(os.path.isfile(path + '.gpg'))
+
+    def test_main_jobs_invalid(self):
+        """Testing: pass import keepass db/keepass.xml --jobs 0."""
+        cmd = ['keepass', tests.db + 'keepass.xml', '--jobs', '0']
+        self.main(cmd, 1, 'The number of jobs must be a positive integer.')
+
+    # Test the resume feature.
+
+    def test_main_resume(self):
+        """Testing: pass import keepass db/keepass.xml --native --resume."""
+        cache = os.path.join(self.prefix, '.cache')
+        cmd = ['keepass', tests.db + 'keepass.xml', '--native']
+        insert = PasswordStore.insert
+        inserted = []
+
+        def interrupted(store, entry):
+            if len(inserted) == 3:
+                raise KeyboardInterrupt
+            insert(store, entry)
+            inserted.append(entry)
+
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': cache}):
+            with mock.patch.object(PasswordStore, 'insert', interrupted):
+                with self.assertRaises(KeyboardInterrupt):
+                    self.main(cmd + ['-q'])
+
+            with tests.captured() as (out, _):
+                self.main(cmd + ['--resume', '-v'])
+                message = out.getvalue()
+        self.assertNotIn('Impossible to insert', message)
+        self.assertEqual(message.count('already exported, skipped.'), 3)
+        journal = os.path.join(cache, 'pass-import', 'journal')
+        self.assertEqual(os.listdir(journal), [])
+
+    def test_main_journal_unwritable(self):
+        """Testing: pass import KeepassXML keepass.xml --native, no cache."""
+        cmd = ['KeepassXML', tests.db + 'keepass.xml', '--native']
+        env = {'XDG_CACHE_HOME': '/dev/null/cache'}
+        with mock.patch.dict(os.environ, env):
+            with tests.captured() as (out, _):
+                self.main(cmd)
+                self.assertIn('Unable to open the export journal',
+                              out.getvalue())
+        self.assertTrue(os.path.isfile(
+            os.path.join(self.prefix, 'keepass', 'CornerCases', 'note.gpg')))
+
+    def test_main_resume_modified(self):
+        """Testing: the journal is not resumed once the source changed."""
+        cache = os.path.join(self.prefix, '.cache')
+        src = os.path.join(self.prefix, '.keepass.xml')
+        shutil.copyfile(tests.db + 'keepass.xml', src)
+        cmd = ['keepass', src, '--native']
+        insert = PasswordStore.insert
+        inserted = []
+
+        def interrupted(store, entry):
+            if len(inserted) == 3:
+                raise KeyboardInterrupt
+            insert(store, entry)
+            inserted.append(entry)
+
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': cache}):
+            with mock.patch.object(PasswordStore, 'insert', interrupted):
+                with self.assertRaises(KeyboardInterrupt):
+                    self.main(cmd + ['-q'])
+
+            stat = os.stat(src)
+            os.utime(src, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            with tests.captured() as (out, _):
+                self.main(cmd + ['--resume', '-v'])
+                message = out.getvalue()
+        self.assertEqual(message.count('already exported, skipped.'), 0)
@@ -54,6 +54,31 @@ class TestMainSanityChecks(tests.Test):
         cmd = ['--list-importers', '--verbose']
         self.main(cmd, 0)
 
+    def test_main_pwned_index(self):
+        """Testing: pimport --pwned-index pwned.txt pwned.bin."""
+        self._tmpdir()
+        src = os.path.join(self.prefix, 'pwned.txt')
+        dst = os.path.join(self.prefix, 'pwned.bin')
+        with open(src, 'w') as file:
+            file.write(f'{"0" * 40}:2\n{"F" * 40}:1\n')
+        cmd = ['--pwned-index', src, dst]
+        self.main(cmd, 0, 'Index of 2 hashes written to')
+        self.assertTrue(os.path.isfile(dst))
+
+    def test_main_pwned_index_invalid(self):
+        """Testing: pimport --pwned-index with an invalid dataset."""
+        self._tmpdir()
+        src = os.path.join(self.prefix, 'pwned.txt')
+        with open(src, 'w') as file:
+            file.write('not a dataset\n')
+        cmd = ['--pwned-index', src, os.path.join(self.prefix, 'pwned.bin')]
+        self.main(cmd, 1, 'is not a valid Pwned Passwords dataset')
+
+    def test_main_filter_invalid(self):
+        """Testing: pimport pass db/lastpass.csv --filter '$.entries[?'."""
+        cmd = ['pass', tests.db + 'lastpass.csv', '--filter', '$.entries[?']
+        self.main(cmd, 1, 'Invalid filter expression')
+
     def test_main_exporter_empty(self):
         """Testing: password exporter not present."""
         cmd = []
@@ -3,6 +3,11 @@
 # Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
 #
 
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest import mock
 
 import pass_import.audit
@@ -27,7 +32,7 @@ class TestPwnedAPI(tests.Test):
     def setUp(self):
         self.api = pass_import.audit.PwnedAPI()
 
-    @mock.patch('requests.get', tests.mock_hibp)
+    @mock.patch('requests.Session.get', tests.mock_hibp)
     def test_password_range(self):
         """Testing: https://api.haveibeenpwned.com/range API."""
         prefix = '21BD1'
@@ -39,11 +44,273 @@ class TestPwnedAPI(tests.Test):
         self.assertTrue(len(hashes) == 11)
 
 
+class PwnedHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the haveibeenpwned range API.
+
+    The first request of every bucket is rate limited, the response is then
+    the same than :func:`~tests.mock_hibp`.
+    """
+    limited = set()
+    requests = []
+
+    def do_GET(self):  # noqa
+        """Answer to a range request."""
+        prefix = self.path.split('/')[-1]
+        self.requests.append(prefix)
+        if prefix not in self.limited:
+            self.limited.add(prefix)
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            return
+
+        body = tests.mock_hibp().text.encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Keep the test output quiet."""
+
+
+class TestPwnedAPIServer(tests.Test):
+    """Test the PwnedAPI class against a local range server."""
+
+    def setUp(self):
+        PwnedHandler.limited = set()
+        PwnedHandler.requests = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), PwnedHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.api = pass_import.audit.PwnedAPI(jobs=4)
+        self.api.url = f"http://127.0.0.1:{self.server.server_port}/range/"
+        self.api.backoff = 0
+
+    def tearDown(self):
+        self.api.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_password_range_retry(self):
+        """Testing: retry a rate limited range request."""
+        prefix = '21BD1'
+        phash = '21BD12DC183F740EE76F27B78EB39C8AD972A757'
+        hashes, counts = self.api.password_range(prefix)
+        self.assertEqual(counts[hashes.index(phash)], 52579)
+        self.assertEqual(PwnedHandler.requests, [prefix, prefix])
+
+    def test_password_ranges(self):
+        """Testing: retrieve several buckets in parallel."""
+        prefixes = [f'{idx:05X}' for idx in range(20)]
+        buckets = self.api.password_ranges(prefixes)
+        self.assertEqual(list(buckets), prefixes)
+        for prefix in prefixes:
+            self.assertEqual(len(buckets[prefix][0]), 11)
+        self.assertEqual(len(PwnedHandler.requests), 40)
+
+    def test_password_range_error(self):
+        """Testing: give up after too many rate limited requests."""
+        self.api.retries = 0
+        with self.assertRaises(pass_import.audit.requests.HTTPError):
+            self.api.password_range('21BD1')
+
+
+class TestPwnedCache(tests.Test):
+    """Test the PwnedCache class."""
+    hprefix = '21BD1'
+    phash = '21BD12DC183F740EE76F27B78EB39C8AD972A757'
+
+    def setUp(self):
+        self._tmpdir()
+        self.cache = pass_import.audit.PwnedCache(self.prefix)
+        self.bucket = ([self.hprefix + line.split(':')[0] for line in
+                        tests.mock_hibp().text.split('\r\n')],
+                       [int(line.split(':')[1]) for line in
+                        tests.mock_hibp().text.split('\r\n')])
+
+    def test_cache(self):
+        """Testing: store and read a bucket in binary form."""
+        self.assertIsNone(self.cache.get(self.hprefix))
+        self.cache.set(self.hprefix, self.bucket)
+        path = os.path.join(self.cache.path, self.hprefix)
+        self.assertEqual(os.path.getsize(path), 11 * 22)
+        self.assertEqual(self.cache.get(self.hprefix), self.bucket)
+
+    def test_cache_ttl(self):
+        """Testing: expired buckets are not returned."""
+        self.cache.set(self.hprefix, self.bucket)
+        path = os.path.join(self.cache.path, self.hprefix)
+        old = time.time() - self.cache.ttl - 1
+        os.utime(path, (old, old))
+        self.assertIsNone(self.cache.get(self.hprefix))
+
+    def test_cache_evict(self):
+        """Testing: the least recently used buckets are removed first."""
+        for idx, prefix in enumerate(['00000', '00001', '00002']):
+            self.cache.set(prefix, self.bucket)
+            path = os.path.join(self.cache.path, prefix)
+            os.utime(path, (idx, time.time()))
+        self.cache.get('00000')
+        self.cache.maxsize = 2 * 11 * 22
+        self.cache.evict()
+        self.assertEqual(sorted(os.listdir(self.cache.path)),
+                         ['00000', '00002'])
+
+    @mock.patch('requests.Session.get')
+    def test_cache_api(self, get):
+        """Testing: the api does not download the cached buckets again."""
+        get.side_effect = tests.mock_hibp
+        api = pass_import.audit.PwnedAPI(cache=self.cache)
+        hashes, _ = api.password_range(self.hprefix)
+        self.assertEqual(api.password_range(self.hprefix)[0], hashes)
+        self.assertIn(self.phash, hashes)
+        self.assertEqual(get.call_count, 1)
+
+    @mock.patch('requests.Session.get')
+    def test_cache_unwritable(self, get):
+        """Testing: the audit goes on without an unwritable cache."""
+        get.side_effect = tests.mock_hibp
+        cache = pass_import.audit.PwnedCache('/dev/null/hibp')
+        api = pass_import.audit.PwnedAPI(cache=cache)
+        hashes, _ = api.password_range(self.hprefix)
+        self.assertIn(self.phash, hashes)
+        self.assertIsInstance(cache.error, OSError)
+        api.password_range('00000')
+        cache.evict()
+        self.assertEqual(get.call_count, 2)
+
+
+class TestPwnedFile(tests.Test):
+    """Test the PwnedFile class."""
+    phash = '21BD12DC183F740EE76F27B78EB39C8AD972A757'
+
+    def setUp(self):
+        self._tmpdir()
+        lines = sorted(f'21BD1{line}' for line in
+                       tests.mock_hibp().text.split('\r\n'))
+        self.dataset = os.path.join(self.prefix, 'pwned.txt')
+        with open(self.dataset, 'w') as file:
+            file.write('\r\n'.join(lines) + '\r\n')
+
+    def test_text(self):
+        """Testing: look for hashes in the text dataset."""
+        with pass_import.audit.PwnedFile(self.dataset) as pwned:
+            self.assertEqual(pwned.count(self.phash), 52579)
+            self.assertEqual(pwned.count(self.phash.lower()), 52579)
+            for line in tests.mock_hibp().text.split('\r\n'):
+                suffix, count = line.split(':')
+                self.assertEqual(pwned.count('21BD1' + suffix), int(count))
+            self.assertEqual(pwned.count('0' * 40), 0)
+            self.assertEqual(pwned.count('F' * 40), 0)
+
+    def test_index(self):
+        """Testing: build and look for hashes in the binary index."""
+        index = os.path.join(self.prefix, 'pwned.bin')
+        self.assertEqual(
+            pass_import.audit.PwnedFile.build(self.dataset, index), 11)
+        self.assertEqual(os.path.getsize(index), 8 + 11 * 24)
+        with pass_import.audit.PwnedFile(index) as pwned:
+            self.assertTrue(pwned.binary)
+            for line in tests.mock_hibp().text.split('\r\n'):
+                suffix, count = line.split(':')
+                self.assertEqual(pwned.count('21BD1' + suffix), int(count))
+            self.assertEqual(pwned.count('21BD1' + '0' * 35), 0)
+
+    def test_index_unordered(self):
+        """Testing: refuse to index a dataset not ordered by hash."""
+        with open(self.dataset, 'w') as file:
+            file.write(f'{"F" * 40}:1\n{"0" * 40}:1\n')
+        index = os.path.join(self.prefix, 'pwned.bin')
+        with self.assertRaises(pass_import.audit.FormatError):
+            pass_import.audit.PwnedFile.build(self.dataset, index)
+        self.assertFalse(os.path.exists(index))
+
+    def test_index_malformed(self):
+        """Testing: no partial index is left from a malformed dataset."""
+        with open(self.dataset, 'w') as file:
+            file.write(f'{"0" * 40}:1\nnot a hash:1\n')
+        index = os.path.join(self.prefix, 'pwned.bin')
+        with self.assertRaises(ValueError):
+            pass_import.audit.PwnedFile.build(self.dataset, index)
+        self.assertEqual(os.listdir(self.prefix),
+                         [os.path.basename(self.dataset)])
+
+    def test_audit(self):
+        """Testing: audit breached passwords against a local dataset."""
+        data = getpath('Password/pwned')
+        hashes = sorted(hashlib.sha1(entry['password'].encode()).hexdigest()
+                        for entry in data[1:])
+        with open(self.dataset, 'w') as file:
+            file.write(''.join(f'{phash}:{idx}\n'
+                               for idx, phash in enumerate(hashes, 1)))
+        audit = pass_import.audit.Audit(data)
+        audit.password(dataset=self.dataset)
+        self.assertEqual(len(audit.breached), len(data) - 1)
+
+
+class TestAuditCache(tests.Test):
+    """Test the AuditCache class."""
+
+    def setUp(self):
+        self._tmpdir()
+        self.path = os.path.join(self.prefix, 'audit.json')
+
+    def test_cache(self):
+        """Testing: store the results, never the passwords."""
+        cache = pass_import.audit.AuditCache(self.path)
+        self.assertIsNone(cache.get('pwned', 'P@ssw0rd'))
+        cache.set('pwned', 42, 'P@ssw0rd')
+        cache.save()
+        with open(self.path, 'r') as file:
+            self.assertNotIn('P@ssw0rd', file.read())
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+        cache = pass_import.audit.AuditCache(self.path)
+        self.assertEqual(cache.get('pwned', 'P@ssw0rd'), 42)
+        self.assertIsNone(cache.get('pwned', 'password'))
+
+    def test_cache_ttl(self):
+        """Testing: expired results are not returned nor saved."""
+        cache = pass_import.audit.AuditCache(self.path)
+        cache.set('pwned', 42, 'P@ssw0rd')
+        cache.ttl = -1
+        self.assertIsNone(cache.get('pwned', 'P@ssw0rd'))
+        cache.save()
+        cache = pass_import.audit.AuditCache(self.path)
+        self.assertEqual(cache.results['pwned'], {})
+
+    @mock.patch('requests.Session.get')
+    def test_cache_audit(self, get):
+        """Testing: only audit the passwords not in the cache."""
+        get.side_effect = tests.mock_hibp
+        data = getpath('Password/pwned')
+        cache = pass_import.audit.AuditCache(self.path)
+        audit = pass_import.audit.Audit(data, cache)
+        audit.password()
+        audit.zxcvbn()
+        cache.save()
+        calls = get.call_count
+
+        cache = pass_import.audit.AuditCache(cache.path)
+        cached = pass_import.audit.Audit(data, cache)
+        with mock.patch('pass_import.audit._zxcvbn') as zxcvbn:
+            cached.password()
+            cached.zxcvbn()
+            zxcvbn.assert_not_called()
+        self.assertEqual(get.call_count, calls)
+        self.assertEqual(cached.breached, audit.breached)
+        self.assertEqual([(password, results['score'])
+                          for password, results in cached.weak],
+                         [(password, results['score'])
+                          for password, results in audit.weak])
+
+
 class TestAudit(tests.Test):
     """Test the Audit class."""
     passwords_nb = 7
 
-    @mock.patch('requests.get', tests.mock_hibp)
+    @mock.patch('requests.Session.get', tests.mock_hibp)
     def test_password_notpwned(self):
         """Testing: audit for password not breached with K-anonymity."""
         data = getpath('Password/notpwned')
@@ -51,7 +318,7 @@ class TestAudit(tests.Test):
         audit.password()
         self.assertTrue(len(audit.breached) == 0)
 
-    @mock.patch('requests.get', tests.mock_hibp)
+    @mock.patch('requests.Session.get', tests.mock_hibp)
     def test_password_pwned(self):
         """Testing: pass audit for password breached with K-anonymity."""
         ref_counts = [52579, 3, 120, 1386, 3730471, 123422, 411]
@@ -96,6 +363,36 @@ class TestAudit(tests.Test):
         self.assertTrue(len(audit.weak) == 0)
         self.assertTrue(len(audit.skipped) == 1)
 
+    def test_zxcvbn_parallel(self):
+        """Testing: parallel zxcvbn gives the same result than serial."""
+        data = getpath('Password/')
+        data.extend(dict(entry) for entry in getpath('Password/pwned'))
+        serial = pass_import.audit.Audit(data)
+        serial.zxcvbn(jobs=1)
+        audit = pass_import.audit.Audit(data)
+        audit.parallel = 1
+        audit.zxcvbn(jobs=2)
+        self.assertEqual(len(audit.weak), len(serial.weak))
+        for (password, results), (ref, refresults) in zip(audit.weak,
+                                                          serial.weak):
+            self.assertEqual(password, ref)
+            self.assertEqual(results['score'], refresults['score'])
+            self.assertEqual(results['guesses'], refresults['guesses'])
+
+    def test_zxcvbn_user_inputs(self):
+        """Testing: zxcvbn ignores binary and long fields as user inputs."""
+        data = [{
+            'password': 'qzvkxwplmj!',
+            'login': 'qzvkxwplmj',
+            'comments': 'A long note about qzvkxwplmj!' * 100,
+            'attachment': b'\x00\x01',
+        }]
+        audit = pass_import.audit.Audit(data)
+        audit.zxcvbn()
+        self.assertTrue(len(audit.weak) == 1)
+        self.assertEqual(audit.weak[0][1]['sequence'][0]['dictionary_name'],
+                         'user_inputs')
+
     def test_duplicates_yes(self):
         """Testing: audit for duplicates password."""
         data = getpath('Password/notpwned/1')
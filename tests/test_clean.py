@@ -36,6 +36,23 @@ class TestStatic(tests.Test):
         self.assertEqual(string, string_expected)
         pass_import.clean.SEPARATOR = '-'
 
+    def test_cleaner_cache(self):
+        """Testing: clean.cleaner is only compiled again on settings change."""
+        cleaner = pass_import.clean.cleaner()
+        self.assertIs(pass_import.clean.cleaner(), cleaner)
+        pass_import.clean.CLEANS[' '] = '_'
+        self.assertEqual(pass_import.clean.cmdline('a b'), 'a_b')
+        self.assertIsNot(pass_import.clean.cleaner(), cleaner)
+        pass_import.clean.CLEANS[' '] = '-'
+        self.assertEqual(pass_import.clean.cmdline('a b'), 'a-b')
+
+    def test_cleaner_unsafe(self):
+        """Testing: clean.Cleaner with replacements to replace again."""
+        cleaner = pass_import.clean.Cleaner('-', {'a': 'b', 'b': 'c'},
+                                            ['http://', 'https://'], [])
+        self.assertEqual(cleaner.cmdline('ab'), 'cc')
+        self.assertEqual(cleaner.protocol('hhttp://ttps://x'), 'x')
+
     def test_group(self):
         """Testing: clean.group."""
         string = 'Root/Group\\Named>root\0directory'
@@ -122,6 +139,21 @@ class TestStatic(tests.Test):
         pass_import.clean.duplicate(data)
         self.assertEqual(data, data_expected)
 
+    def test_duplicate_existing(self):
+        """Testing: clean.duplicate with already numbered paths."""
+        paths = ['a', 'a-1', 'a', 'a', 'a-1', 'b', 'a']
+        data = [{'path': path} for path in paths]
+        paths_expected = ['a', 'a-1', 'a-2', 'a-3', 'a-1-1', 'b', 'a-4']
+        pass_import.clean.duplicate(data)
+        self.assertEqual([entry['path'] for entry in data], paths_expected)
+
+    def test_duplicate_many(self):
+        """Testing: clean.duplicate with many identical paths."""
+        data = [{'path': 'Login'} for _ in range(5000)]
+        pass_import.clean.duplicate(data)
+        paths_expected = ['Login'] + [f'Login-{idx}' for idx in range(1, 5000)]
+        self.assertEqual([entry['path'] for entry in data], paths_expected)
+
 
 class TestClean(tests.Test):
     """Base class for entry cleaning tests."""
@@ -3,9 +3,12 @@
 # Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
 #
 
+import io
 import os
+from unittest import mock
 
 import pass_import.auto
+from pass_import.formats.xml import prolog
 import tests
 
 
@@ -101,3 +104,142 @@ class TestDetect(tests.Test):
                         self.assertEqual(identical[manager], pm.__name__)
                 else:
                     self.assertEqual(manager, pm.__name__)
+
+    def test_source(self):
+        """Testing: shared source views over a file read once."""
+        path = os.path.join(tests.db, 'keepass.kdbx')
+        source = pass_import.auto.Source(path)
+        binary = source.view('rb')
+        self.assertEqual(binary.read(4), b'\x03\xd9\xa2\x9a')
+        self.assertEqual(source.view('rb').read(4), b'\x03\xd9\xa2\x9a')
+
+        path = os.path.join(tests.db, 'buttercup.csv')
+        source = pass_import.auto.Source(path)
+        with open(path, 'r', encoding='utf-8') as file:
+            self.assertEqual(source.view().read(), file.read())
+
+    def test_header_index(self):
+        """Testing: header signature index candidates and their order."""
+        managers = pass_import.Managers()
+        index = pass_import.auto.HeaderIndex(managers.classes(frmt='csv'))
+        pm = tests.managers.get('Buttercup')
+        signature = pm.signature() | {'extra'}
+        candidates = index.candidates(signature)
+        self.assertIn(pm, candidates)
+        for candidate in candidates:
+            self.assertTrue(candidate.signature() <= signature)
+        sizes = [len(candidate.signature()) for candidate in candidates]
+        self.assertEqual(sizes, sorted(sizes, reverse=True))
+        self.assertEqual(index.candidates(None), index.ordered)
+
+    def test_prefilter(self):
+        """Testing: prefilter the formats from the head of the file."""
+        formats = pass_import.Detecters()
+        heads = {
+            'csv': b'url,username,password',
+            'xml': b'<?xml version="1.0" encoding="UTF-8"?>',
+            'json': b'{"version": 1}',
+            'kdbx': b'\x03\xd9\xa2\x9a\x67\xfb\x4b\xb5\x01\x00\x03\x00',
+            'yaml': b'---  # comment\ncredentials:\n- name: foo',
+            'keychain': b'keychain: "/Users/user/login.keychain"',
+        }
+        excluded = {
+            'csv': ['xml', 'json', 'kdbx'],
+            'xml': ['csv', 'json', 'kdbx', 'yaml', 'keychain'],
+            'json': ['csv', 'xml', 'kdbx', 'yaml', 'keychain'],
+            'kdbx': ['csv', 'xml', 'json', 'yaml', 'keychain'],
+            'yaml': ['csv', 'xml', 'kdbx'],
+            'keychain': ['csv', 'xml', 'json', 'kdbx', 'yaml'],
+        }
+        for frmt, head in heads.items():
+            with self.subTest(frmt):
+                self.assertTrue(formats[frmt].prefilter(head))
+                for other in excluded[frmt]:
+                    self.assertFalse(formats[frmt].prefilter(heads[other]))
+
+        path = os.path.join(tests.db, 'saferpass.csv')
+        source = pass_import.auto.Source(path)
+        self.assertTrue(source.head.startswith(b'"modelType"'))
+
+    def test_detection_tree(self):
+        """Testing: reuse the data decoded during the detection."""
+        for manager in ['BitwardenJSON', 'Passpie', 'AppleKeychain',
+                        'OnePassword4PIF']:
+            with self.subTest(manager):
+                path = os.path.join(tests.db, tests.conf[manager]['path'])
+                detect = pass_import.auto.AutoDetect()
+                pm = detect.manager(path)
+                self.assertEqual(pm.__name__, manager)
+                self.assertIs(detect.detection.pm, pm)
+                self.assertIsNotNone(detect.detection.tree)
+
+                with pm(path) as importer:
+                    importer.settree(detect.detection.tree)
+                    importer.parse()
+                    data = importer.data
+                with pm(path) as importer:
+                    importer.parse()
+                    self.assertEqual(data, importer.data)
+
+    def test_xml_prolog(self):
+        """Testing: read the XML doctype and root tag, not the whole file."""
+        path = os.path.join(tests.db, 'keepassx.xml')
+        with open(path, 'r', encoding='utf-8') as file:
+            res = prolog(file, chunksize=64)
+            self.assertEqual(res, ('<!DOCTYPE KEEPASSX_DATABASE>', 'database'))
+            self.assertFalse(file.read() == '')
+
+        res = prolog(io.StringIO('<?xml version="1.0"?><root><unclosed>'))
+        self.assertEqual(res, ('', 'root'))
+        with self.assertRaises(ValueError):
+            prolog(io.StringIO('<!DOCTYPE a [<!ENTITY e "x">]><a>&e;</a>'))
+
+    def test_manager_xml_no_doctype(self):
+        """Testing: detect an XML file without its optional doctype."""
+        self._tmpdir()
+        path = os.path.join(self.prefix, 'keepassx.xml')
+        with open(os.path.join(tests.db, 'keepassx.xml'), 'r') as file:
+            data = file.read()
+        with open(path, 'w') as file:
+            file.write(data.replace('<!DOCTYPE KEEPASSX_DATABASE>\n', ''))
+        detect = pass_import.auto.AutoDetect()
+        self.assertEqual(detect.manager(path).__name__, 'KeepassxXML')
+
+    def test_detect_cache(self):
+        """Testing: detection cache keyed by file fingerprint."""
+        self._tmpdir()
+        cachepath = os.path.join(self.prefix, 'detect.json')
+        path = os.path.join(self.prefix, 'export.csv')
+        with open(os.path.join(tests.db, 'buttercup.csv'), 'r') as file:
+            content = file.read()
+        with open(path, 'w') as file:
+            file.write(content)
+
+        cache = pass_import.auto.DetectCache(cachepath)
+        self.assertEqual(cache.get(path), {})
+        cache.set(path, managers={'': 'Buttercup'})
+        cache.save()
+        cache = pass_import.auto.DetectCache(cachepath)
+        self.assertEqual(cache.get(path)['managers'], {'': 'Buttercup'})
+
+        # The managers detected with other settings are not reused.
+        settings = {'delimiter': ';'}
+        cache.set(path, settings, managers={'': 'Buttercup'})
+        self.assertEqual(cache.get(path, settings)['managers'],
+                         {'': 'Buttercup'})
+        self.assertEqual(cache.get(path, {'delimiter': ','}), {})
+        self.assertEqual(cache.get(path, {'delimiter': ';', 'cols': 'a'}), {})
+
+        # A modified file is not in the cache anymore.
+        with open(path, 'a') as file:
+            file.write('\n')
+        cache = pass_import.auto.DetectCache(cachepath)
+        self.assertEqual(cache.get(path), {})
+
+        # The cache is dropped when the registry version changes.
+        cache.set(path, managers={'': 'Buttercup'})
+        cache.save()
+        with mock.patch.object(pass_import.auto.DetectCache, 'registry',
+                               return_value='other'):
+            cache = pass_import.auto.DetectCache(cachepath)
+            self.assertEqual(cache.get(path), {})
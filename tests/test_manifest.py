@@ -0,0 +1,75 @@
+# -*- encoding: utf-8 -*-
+# pass-import - test suite
+# Copyright (C) 2017-2024 Alexandre PUJOL <alexandre@pujol.io>.
+#
+
+import subprocess  # nosec
+import sys
+
+import pass_import
+from pass_import import manifest
+from pass_import.core import Cap, get_detecters
+import tests
+
+
+class TestManifest(tests.Test):
+    """Test the manifest of the password managers and detecters."""
+
+    def test_manifest_managers(self):
+        """Testing: the manifest is up to date, run 'make manifest' if not."""
+        managers = sorted(tests.managers, key=lambda pm: pm.__name__)
+        self.assertEqual(manifest.MANAGERS,
+                         [pass_import.metadata(pm) for pm in managers])
+
+    def test_manifest_detecters(self):
+        """Testing: the manifest detecters are up to date."""
+        detecters = sorted(get_detecters(), key=lambda cls: cls.__name__)
+        self.assertEqual(manifest.DETECTERS, [
+            pass_import.metadata(cls, detecter=True) for cls in detecters
+        ])
+
+    def test_manifest_registry(self):
+        """Testing: the manifest provides the same registry."""
+        registry = pass_import.Manifest()
+        for cap in (Cap.IMPORT, Cap.EXPORT):
+            with self.subTest(cap):
+                self.assertEqual(registry.names(cap),
+                                 tests.managers.names(cap))
+                self.assertEqual(registry.clsnames(cap),
+                                 tests.managers.clsnames(cap))
+                matrix = {
+                    name: [pm.__name__ for pm in pms]
+                    for name, pms in tests.managers.matrix(cap).items()
+                }
+                self.assertEqual({
+                    name: [pm.__name__ for pm in pms]
+                    for name, pms in registry.matrix(cap).items()
+                }, matrix)
+
+        for cap in (Cap.FORMAT, Cap.DECRYPT):
+            with self.subTest(cap):
+                detecters = pass_import.Detecters(cap)
+                self.assertEqual({
+                    frmt: cls.__name__
+                    for frmt, cls in registry.detecters(cap).items()
+                }, {frmt: cls.__name__ for frmt, cls in detecters.items()})
+
+    def test_manifest_get(self):
+        """Testing: the manifest returns the real class."""
+        registry = pass_import.Manifest()
+        self.assertIs(registry.get('keepass', 'csv'),
+                      tests.managers.get('KeepassCSV'))
+        self.assertIs(registry.get('PasswordStore', cap=Cap.EXPORT),
+                      tests.managers.get('PasswordStore'))
+        with self.assertRaises(pass_import.ManagerError):
+            registry.get('not-a-manager')
+
+    def test_manifest_lazy(self):
+        """Testing: no manager module is imported on startup."""
+        code = ("import sys\n"
+                "import pass_import.__main__\n"
+                "print(sorted(name for name in sys.modules if name.startswith("
+                "('pass_import.managers.', 'pykeepass'))))\n")
+        res = subprocess.run([sys.executable, '-c', code], check=True,
+                             capture_output=True, text=True)  # nosec
+        self.assertEqual(res.stdout.strip(), '[]')
@@ -173,3 +173,61 @@ class TestConfig(tests.Test):
         self.assertEqual(
             message,
             '\x1b[1m\x1b[91m [x] \x1b[0m\x1b[1mError: \x1b[0mcritical error')
+
+
+class TestJournal(tests.Test):
+    """Test the Journal class."""
+
+    def setUp(self):
+        self._tmpdir()
+        self.path = os.path.join(self.prefix, 'journal', 'key')
+
+    def test_journal(self):
+        """Testing: journal add, load and remove."""
+        journal = pass_import.tools.Journal(self.path)
+        journal.open()
+        journal.add('Social/twitter.com')
+        journal.add('Bank/aib\nnewline')
+        journal.close()
+
+        journal = pass_import.tools.Journal(self.path)
+        journal.load()
+        self.assertIn('Social/twitter.com', journal)
+        self.assertIn('Bank/aib\nnewline', journal)
+        self.assertNotIn('Bank/aib', journal)
+        journal.remove()
+        self.assertFalse(os.path.isfile(self.path))
+
+    def test_journal_truncated(self):
+        """Testing: journal with a truncated last line."""
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w') as file:
+            file.write('"Social/twitter.com"\n"Bank/ai')
+        journal = pass_import.tools.Journal(self.path)
+        journal.load()
+        self.assertEqual(journal.done, {'Social/twitter.com'})
+
+    def test_journal_truncated_resume(self):
+        """Testing: resume a journal with a truncated last line."""
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w') as file:
+            file.write('"Social/twitter.com"\n"Bank/ai')
+        journal = pass_import.tools.Journal(self.path)
+        journal.open(resume=True)
+        journal.add('Bank/aib')
+        journal.close()
+        journal = pass_import.tools.Journal(self.path)
+        journal.load()
+        self.assertEqual(journal.done, {'Social/twitter.com', 'Bank/aib'})
+
+    def test_journal_no_resume(self):
+        """Testing: journal is truncated when not resumed."""
+        journal = pass_import.tools.Journal(self.path)
+        journal.open()
+        journal.add('Social/twitter.com')
+        journal.close()
+        journal.open(resume=False)
+        journal.close()
+        journal = pass_import.tools.Journal(self.path)
+        journal.load()
+        self.assertEqual(journal.done, set())